@@ -96,7 +96,7 @@ def inspect_addin_excel(
 
         with zipfile.ZipFile(path) as zf:
             is_zip = True
-            names = set(zf.namelist())
+            names = zf.NameToInfo  # name -> ZipInfo; O(1) membership without building a list + set
             has_vba_project = "xl/vbaProject.bin" in names
             if _CUSTOM_UI_PART in names:
                 custom_ui["part"] = _CUSTOM_UI_PART
@@ -594,6 +594,7 @@ def reprocess_dataset_from_task(
                 description=description,
                 max_workers=max_workers,
                 verbose=verbose,
+                preloaded_frames=outputs.frames(),
             )
         finally:
             stage_td.cleanup()
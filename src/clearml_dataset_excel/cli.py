@@ -157,8 +157,10 @@ def _iter_candidate_files(
 
 
 def _print_dry_run(*, items: list[ResolvedItem], rows: list[dict], skipped: int, args: argparse.Namespace) -> int:
-    local_items = [it for it in items if not is_url(it.source)]
-    external_items = [it for it in items if is_url(it.source)]
+    local_items: list[ResolvedItem] = []
+    external_items: list[ResolvedItem] = []
+    for it in items:
+        (external_items if is_url(it.source) else local_items).append(it)
 
     print(f"Rows: {len(rows)}")
     print(f"Items: {len(items)} (local={len(local_items)} external={len(external_items)} skipped={skipped})")
@@ -1040,6 +1042,7 @@ def _main_run(argv: Sequence[str] | None = None) -> int:
                 description=args.description,
                 max_workers=args.max_workers,
                 verbose=bool(args.verbose),
+                preloaded_frames=outputs.frames(),
             )
         else:
             stage_td = stage_dataset_payload(
@@ -1066,6 +1069,7 @@ def _main_run(argv: Sequence[str] | None = None) -> int:
                     description=args.description,
                     max_workers=args.max_workers,
                     verbose=bool(args.verbose),
+                    preloaded_frames=outputs.frames(),
                 )
             finally:
                 stage_td.cleanup()
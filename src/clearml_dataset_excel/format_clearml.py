@@ -1,22 +1,105 @@
 from __future__ import annotations
 
+import json
 import os
 import shutil
+import stat
+import sys
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Iterable
 
+try:
+    import numpy as np
+    import pandas as pd
+except Exception:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+    pd = None  # type: ignore[assignment]
+
+try:
+    import yaml
+except Exception:  # pragma: no cover
+    yaml = None  # type: ignore[assignment]
+
+try:
+    import orjson  # optional, faster payload.json serialization
+except Exception:
+    orjson = None  # type: ignore[assignment]
+
 from .format_processor import ProcessOutputs
 from .format_spec import DatasetFormatSpec, spec_to_yaml_dict, with_clearml_values
 
 
+@lru_cache(maxsize=4096)
+def _resolved_path(path_str: str) -> Path:
+    """Path(path_str).resolve(), cached (cleared at the start of each staging call)."""
+    return Path(path_str).resolve()
+
+
+def _ensure_parent_dirs(pairs: Iterable[tuple[Path, Path]]) -> None:
+    """Create each distinct dst parent once (instead of one mkdir per file)."""
+    for d in sorted({dst.parent for _, dst in pairs}):
+        d.mkdir(parents=True, exist_ok=True)
+
+
 def _link_or_copy(src: Path, dst: Path) -> None:
-    dst.parent.mkdir(parents=True, exist_ok=True)
+    """Link or copy src to dst. dst.parent must already exist (see _ensure_parent_dirs)."""
     try:
         os.link(src, dst)
     except OSError:
-        shutil.copy2(src, dst)
+        # Stage dirs are throwaway: copyfile (sendfile fast path) without copystat is enough.
+        shutil.copyfile(src, dst)
+
+
+def _link_exclusive(src: Path, dst: Path) -> str:
+    """
+    Hard-link (or copy) src to dst without ever replacing an existing dst.
+    Returns "linked" (linked or copied), "same" (dst already is src) or "collision".
+    """
+    try:
+        os.link(src, dst)
+        return "linked"
+    except FileExistsError:
+        pass
+    except FileNotFoundError:
+        if dst.parent.exists():
+            raise
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        return _link_exclusive(src, dst)
+    except OSError:
+        # Cross-device/unsupported link: copy instead, unless something is already there.
+        if not os.path.lexists(dst):
+            shutil.copyfile(src, dst)
+            return "linked"
+    try:
+        st_dst = os.stat(dst)
+        st_src = os.stat(src)
+    except OSError:
+        return "collision"
+    return "same" if (st_dst.st_dev, st_dst.st_ino) == (st_src.st_dev, st_src.st_ino) else "collision"
+
+
+def _map_pairs(fn: Any, pairs: list[tuple[Path, Path]]) -> list[Any]:
+    """Run fn(src, dst) for each pair on a thread pool; results are returned in input order."""
+    if len(pairs) <= 1:
+        return [fn(src, dst) for src, dst in pairs]
+    max_workers = min(32, (os.cpu_count() or 1) * 4, len(pairs))
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        return list(ex.map(lambda sd: fn(*sd), pairs))
+
+
+def _link_or_copy_many(pairs: Iterable[tuple[Path, Path]]) -> None:
+    """
+    Link/copy (src, dst) pairs concurrently.
+    Later pairs win when several target the same dst (same as calling _link_or_copy in order).
+    """
+    jobs = list({dst: (src, dst) for src, dst in pairs}.values())
+    _ensure_parent_dirs(jobs)
+    _map_pairs(_link_or_copy, jobs)
 
 
 def _ensure_empty_dir(path: Path, *, overwrite: bool) -> None:
@@ -42,9 +125,9 @@ def _find_requirements_txt() -> Path | None:
     ]
     for p in candidates:
         try:
-            if p.exists() and p.is_file():
+            if stat.S_ISREG(os.stat(p).st_mode):
                 return p
-        except Exception:
+        except OSError:
             continue
     return None
 
@@ -99,19 +182,22 @@ def stage_template_payload_to_dir(
     stage = Path(stage_dir).expanduser().resolve()
     _ensure_empty_dir(stage, overwrite=overwrite)
 
-    _link_or_copy(spec_path, stage / "spec" / spec_path.name)
-    _link_or_copy(template_excel, stage / "template" / template_excel.name)
+    pairs: list[tuple[Path, Path]] = [
+        (spec_path, stage / "spec" / spec_path.name),
+        (template_excel, stage / "template" / template_excel.name),
+    ]
     if template_excel_windows is not None:
-        _link_or_copy(template_excel_windows, stage / "template" / template_excel_windows.name)
+        pairs.append((template_excel_windows, stage / "template" / template_excel_windows.name))
     if addin_xlam_windows is not None:
-        _link_or_copy(addin_xlam_windows, stage / "template" / addin_xlam_windows.name)
+        pairs.append((addin_xlam_windows, stage / "template" / addin_xlam_windows.name))
     if vba_module is not None:
-        _link_or_copy(vba_module, stage / "template" / vba_module.name)
+        pairs.append((vba_module, stage / "template" / vba_module.name))
     if runner_exe_windows is not None:
-        _link_or_copy(runner_exe_windows, stage / "template" / runner_exe_windows.name)
+        pairs.append((runner_exe_windows, stage / "template" / runner_exe_windows.name))
     if spec.addin.enabled:
         spec_name = spec.addin.spec_filename or spec_path.name
-        _link_or_copy(spec_path, stage / "template" / spec_name)
+        pairs.append((spec_path, stage / "template" / spec_name))
+    _link_or_copy_many(pairs)
 
     meta = {
         "payload_version": 1,
@@ -146,29 +232,41 @@ def stage_dataset_payload_to_dir(
     _ensure_empty_dir(stage, overwrite=overwrite)
 
     # Spec + template
-    _link_or_copy(spec_path, stage / "spec" / spec_path.name)
-    _link_or_copy(template_excel, stage / "template" / template_excel.name)
+    pairs: list[tuple[Path, Path]] = [
+        (spec_path, stage / "spec" / spec_path.name),
+        (template_excel, stage / "template" / template_excel.name),
+    ]
     if template_excel_windows is not None:
-        _link_or_copy(template_excel_windows, stage / "template" / template_excel_windows.name)
+        pairs.append((template_excel_windows, stage / "template" / template_excel_windows.name))
     if addin_xlam_windows is not None:
-        _link_or_copy(addin_xlam_windows, stage / "template" / addin_xlam_windows.name)
+        pairs.append((addin_xlam_windows, stage / "template" / addin_xlam_windows.name))
     if vba_module is not None:
-        _link_or_copy(vba_module, stage / "template" / vba_module.name)
+        pairs.append((vba_module, stage / "template" / vba_module.name))
     if runner_exe_windows is not None:
-        _link_or_copy(runner_exe_windows, stage / "template" / runner_exe_windows.name)
+        pairs.append((runner_exe_windows, stage / "template" / runner_exe_windows.name))
     if spec.addin.enabled:
         # Place spec next to the template so the VBA module can resolve it via ThisWorkbook.Path
         spec_name = spec.addin.spec_filename or spec_path.name
-        _link_or_copy(spec_path, stage / "template" / spec_name)
+        pairs.append((spec_path, stage / "template" / spec_name))
 
-    # Inputs
+    # Inputs (dedupe runs serially; linking/copying runs concurrently below and never overwrites)
     base_dir = condition_excel.parent.resolve()
     input_dir = stage / "input"
     seen_src: set[str] = set()
     src_abs_to_dest_rel: dict[str, str] = {}
+    planned_dest: set[str] = set()
+    input_pairs: list[tuple[Path, Path]] = []
+    # raw_path_map values usually repeat uploaded_files entries; resolve each distinct path only once.
+    _resolved_path.cache_clear()
+    # str(path) -> resolved posix key; doubles as the raw-spelling dedupe set and is reused for raw_path_map.
+    raw_to_key: dict[str, str] = {}
     for i, p in enumerate(outputs.uploaded_files):
-        p = p.resolve()
+        raw_key = str(p)
+        if raw_key in raw_to_key:
+            continue
+        p = _resolved_path(raw_key)
         p_key = p.as_posix()
+        raw_to_key[raw_key] = p_key
         if p_key in seen_src:
             continue
         seen_src.add(p_key)
@@ -177,31 +275,36 @@ def stage_dataset_payload_to_dir(
             dest = input_dir / rel
         except ValueError:
             dest = input_dir / "external" / f"{i:03d}_{p.name}"
-        if dest.exists():
-            try:
-                if dest.samefile(p):
-                    continue
-            except Exception:
-                pass
+        dest_key = dest.as_posix()
+        if dest_key in planned_dest:
             raise RuntimeError(f"Staging collision: {dest} <- {p}")
-        _link_or_copy(p, dest)
+        planned_dest.add(dest_key)
+        input_pairs.append((p, dest))
         src_abs_to_dest_rel[p_key] = dest.relative_to(stage).as_posix()
 
+    _ensure_parent_dirs(input_pairs)
+    for (src, dest), result in zip(input_pairs, _map_pairs(_link_exclusive, input_pairs)):
+        if result == "collision":
+            raise RuntimeError(f"Staging collision: {dest} <- {src}")
+
     # Processed outputs
     processed_dir = stage / "processed"
-    _link_or_copy(outputs.conditions_csv, processed_dir / outputs.conditions_csv.name)
-    _link_or_copy(outputs.canonical_csv, processed_dir / outputs.canonical_csv.name)
-    _link_or_copy(outputs.consolidated_excel, processed_dir / outputs.consolidated_excel.name)
+    pairs.append((outputs.conditions_csv, processed_dir / outputs.conditions_csv.name))
+    pairs.append((outputs.canonical_csv, processed_dir / outputs.canonical_csv.name))
+    pairs.append((outputs.consolidated_excel, processed_dir / outputs.consolidated_excel.name))
+    _link_or_copy_many(pairs)
 
     # Convenience metadata
     raw_path_map: dict[str, str] = {}
     for raw, resolved in outputs.raw_path_map.items():
-        resolved_key = resolved.resolve().as_posix()
+        resolved_str = str(resolved)
+        resolved_key = raw_to_key.get(resolved_str) or _resolved_path(resolved_str).as_posix()
         dest_rel = src_abs_to_dest_rel.get(resolved_key)
         if dest_rel is not None:
             raw_path_map[str(raw)] = dest_rel
 
-    excel_key = condition_excel.resolve().as_posix()
+    excel_str = str(condition_excel)
+    excel_key = raw_to_key.get(excel_str) or _resolved_path(excel_str).as_posix()
     excel_rel = src_abs_to_dest_rel.get(excel_key) or f"input/{condition_excel.name}"
 
     meta = {
@@ -300,8 +403,11 @@ def stage_dataset_payload(
 
 
 def _json_dumps(obj: Any) -> str:
-    import json
-
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
     return json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=True)
 
 
@@ -317,10 +423,14 @@ def upload_dataset(
     description: str | None = None,
     max_workers: int | None = None,
     verbose: bool = False,
+    preloaded_frames: dict[str, Any] | None = None,
 ) -> str:
     """
     Create (or create a writable copy of) a ClearML Dataset, upload staged files, and finalize.
     Returns dataset id.
+
+    preloaded_frames: optional in-memory "conditions"/"canonical" DataFrames matching the staged
+    processed CSVs (see ProcessOutputs.frames()); used for stats instead of re-reading the CSVs.
     """
     try:
         from clearml import Dataset
@@ -377,6 +487,8 @@ def upload_dataset(
 
     # Attach configuration + artifacts to the Dataset's task (if accessible)
     task = getattr(dataset, "_task", None)
+    artifact_thread: threading.Thread | None = None
+    artifact_errors: list[BaseException] = []
 
     # Best-effort: write dataset/task link into the visible template Info sheet
     try:
@@ -384,8 +496,6 @@ def upload_dataset(
 
         template_paths: list[Path] = []
         try:
-            import json
-
             meta = json.loads((stage_dir / "payload.json").read_text(encoding="utf-8"))
             if isinstance(meta, dict):
                 for k in ("template_excel", "template_excel_windows"):
@@ -423,9 +533,7 @@ def upload_dataset(
 
         # Also store the full spec YAML into Hyperparameters for easy editing in clone/enqueue workflows.
         try:
-            if hasattr(task, "connect"):
-                import yaml
-
+            if yaml is not None and hasattr(task, "connect"):
                 spec_yaml = yaml.safe_dump(
                     spec_to_yaml_dict(spec_for_task),
                     allow_unicode=True,
@@ -476,60 +584,95 @@ def upload_dataset(
         except Exception:
             pass
 
-        # Upload key artifacts for easy download (spec/template/consolidated)
+        # Upload key artifacts for easy download (spec/template/consolidated).
+        # Runs in the background so network-bound uploads overlap with add_files hashing. It is joined before this
+        # function returns or raises; artifacts are best-effort, so an upload error is only reported.
+        artifact_thread = threading.Thread(
+            target=_upload_task_artifacts,
+            args=(task, stage_dir, artifact_errors),
+            name="clearml_dataset_excel_artifacts",
+            daemon=True,
+        )
+        artifact_thread.start()
+
+    try:
+        # Upload staged payload into dataset
+        dataset.add_files(
+            path=stage_dir.as_posix(),
+            local_base_folder=stage_dir.as_posix(),
+            dataset_path=".",
+            recursive=True,
+            verbose=verbose,
+            max_workers=max_workers,
+        )
+
+        # Report coverage/stats and a few debug samples
         try:
-            template_file = stage_dir / "template"
-            spec_file = stage_dir / "spec"
-            processed_file = stage_dir / "processed"
-            for p in _iter_files(spec_file):
-                task.upload_artifact(name=p.name, artifact_object=p.as_posix(), wait_on_upload=True)
-            for p in _iter_files(template_file):
-                task.upload_artifact(name=p.name, artifact_object=p.as_posix(), wait_on_upload=True)
-            for p in _iter_files(processed_file):
-                task.upload_artifact(name=p.name, artifact_object=p.as_posix(), wait_on_upload=True)
+            _report_dataset_stats(
+                dataset=dataset,
+                stage_dir=stage_dir,
+                spec=spec_for_task,
+                preloaded_frames=preloaded_frames,
+            )
         except Exception:
             pass
 
-    # Upload staged payload into dataset
-    dataset.add_files(
-        path=stage_dir.as_posix(),
-        local_base_folder=stage_dir.as_posix(),
-        dataset_path=".",
-        recursive=True,
-        verbose=verbose,
-        max_workers=max_workers,
-    )
-
-    # Report coverage/stats and a few debug samples
-    try:
-        _report_dataset_stats(dataset=dataset, stage_dir=stage_dir, spec=spec_for_task)
-    except Exception:
-        pass
-
-    dataset.upload(show_progress=verbose, verbose=verbose, output_url=resolved_output_uri, max_workers=max_workers)
+        dataset.upload(show_progress=verbose, verbose=verbose, output_url=resolved_output_uri, max_workers=max_workers)
+    finally:
+        if artifact_thread is not None:
+            artifact_thread.join()
+    for e in artifact_errors:
+        print(f"Warning: failed to upload task artifacts: {e}", file=sys.stderr)
     ok = dataset.finalize(verbose=verbose, auto_upload=False)
     if not ok:
         raise RuntimeError("Dataset finalize failed")
     return str(dataset.id)
 
 
+def _upload_task_artifacts(task: Any, stage_dir: Path, errors: list[BaseException]) -> None:
+    # Thread target: the error is handed back to upload_dataset, which only reports it (artifacts are best-effort).
+    try:
+        for sub in ("spec", "template", "processed"):
+            for p in _iter_files(stage_dir / sub):
+                task.upload_artifact(name=p.name, artifact_object=p.as_posix(), wait_on_upload=True)
+    except Exception as e:
+        errors.append(e)
+
+
 def _iter_files(folder: Path) -> Iterable[Path]:
     if not folder.exists():
         return []
-    return sorted([p for p in folder.rglob("*") if p.is_file()])
-
+    out: list[Path] = []
+    stack = [os.fspath(folder)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    stack.append(e.path)
+                elif e.is_file():
+                    out.append(Path(e.path))
+    out.sort()
+    return out
 
-def _report_dataset_stats(*, dataset: Any, stage_dir: Path, spec: DatasetFormatSpec) -> None:
-    import pandas as pd
 
+def _report_dataset_stats(
+    *,
+    dataset: Any,
+    stage_dir: Path,
+    spec: DatasetFormatSpec,
+    preloaded_frames: dict[str, Any] | None = None,
+) -> None:
     logger = dataset.get_logger()
+    preloaded = preloaded_frames or {}
 
     processed_dir = stage_dir / "processed"
     cond_csv = processed_dir / spec.output.conditions_filename
     canon_csv = processed_dir / spec.output.canonical_filename
 
     if cond_csv.exists():
-        cond_df = pd.read_csv(cond_csv)
+        cond_df = preloaded.get("conditions")
+        if cond_df is None:
+            cond_df = pd.read_csv(cond_csv)
         logger.report_scalar("Counts", "conditions_rows", float(len(cond_df)), 0)
         logger.report_scalar("Counts", "conditions_columns", float(len(cond_df.columns)), 0)
         cov = _missing_table(cond_df)
@@ -539,18 +682,21 @@ def _report_dataset_stats(*, dataset: Any, stage_dir: Path, spec: DatasetFormatS
         # File-path column coverage (fill rate per file spec)
         try:
             rows: list[dict[str, object]] = []
+            # Only the path columns are needed here; project them once instead of converting per file spec.
+            path_cols = list(dict.fromkeys(f.path_column for f in spec.files if f.path_column in cond_df.columns))
+            paths = cond_df.loc[:, path_cols]
+            filled_df = paths.notna()
+            try:
+                blank = np.frompyfunc(_is_blank_str, 1, 1)(paths.to_numpy(dtype=object)).astype(bool)
+                filled_df = filled_df & ~blank
+            except Exception:
+                pass
             for f in spec.files:
                 col = f.path_column
-                if col not in cond_df.columns:
+                if col not in filled_df.columns:
                     continue
-                s0 = cond_df[col]
-                try:
-                    s = s0.astype(str)
-                    filled = (~s0.isna()) & (s.str.strip() != "")
-                    unique_paths = int(s[filled].nunique(dropna=True))
-                except Exception:
-                    filled = ~s0.isna()
-                    unique_paths = int(s0[filled].nunique(dropna=True))
+                filled = filled_df[col]
+                unique_paths = int(paths.loc[filled, col].astype(str).nunique(dropna=True))
                 total = int(len(cond_df))
                 filled_n = int(filled.sum())
                 rows.append(
@@ -572,7 +718,9 @@ def _report_dataset_stats(*, dataset: Any, stage_dir: Path, spec: DatasetFormatS
         cond_df = None
 
     if canon_csv.exists():
-        canon_df = pd.read_csv(canon_csv)
+        canon_df = preloaded.get("canonical")
+        if canon_df is None:
+            canon_df = pd.read_csv(canon_csv)
         logger.report_scalar("Counts", "canonical_rows", float(len(canon_df)), 0)
         logger.report_scalar("Counts", "canonical_columns", float(len(canon_df.columns)), 0)
         cov = _missing_table(canon_df)
@@ -607,33 +755,25 @@ def _report_dataset_stats(*, dataset: Any, stage_dir: Path, spec: DatasetFormatS
     # Debug images (if any)
     input_dir = stage_dir / "input"
     if input_dir.exists():
+        exts, imgs, tabs = _scan_input_dir(input_dir)
+
         # File extension summary (quick sanity check)
         try:
-            exts: dict[str, int] = {}
-            for p in input_dir.rglob("*"):
-                if not p.is_file():
-                    continue
-                ext = p.suffix.lower() or "<none>"
-                exts[ext] = int(exts.get(ext, 0) + 1)
             if exts and hasattr(logger, "report_table"):
                 rows = [{"ext": k, "count": int(v)} for k, v in sorted(exts.items(), key=lambda kv: (-kv[1], kv[0]))]
                 logger.report_table("Summary", "input_file_ext_counts", iteration=0, table_plot=pd.DataFrame(rows))
         except Exception:
             pass
 
-        exts = {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff"}
-        imgs = [p for p in input_dir.rglob("*") if p.is_file() and p.suffix.lower() in exts]
         for i, p in enumerate(sorted(imgs)[:20]):
             logger.report_image("Debug Samples", "images", iteration=i, local_path=p.as_posix(), delete_after_upload=False)
 
         # Debug tabular samples (CSV/TSV head)
         try:
-            tab_exts = {".csv", ".tsv"}
-            tabs = [p for p in input_dir.rglob("*") if p.is_file() and p.suffix.lower() in tab_exts]
             for i, p in enumerate(sorted(tabs)[:10]):
                 try:
                     sep = "\t" if p.suffix.lower() == ".tsv" else ","
-                    df = pd.read_csv(p, sep=sep, nrows=50)
+                    df = _read_csv_head(p, sep=sep, nrows=50)
                     logger.report_table("Debug Samples", f"tabular_head/{p.name}", iteration=i, table_plot=df)
                 except Exception:
                     continue
@@ -641,64 +781,142 @@ def _report_dataset_stats(*, dataset: Any, stage_dir: Path, spec: DatasetFormatS
             pass
 
 
-def _missing_table(df):  # type: ignore[no-untyped-def]
-    import pandas as pd
+_IMAGE_EXTS = frozenset((".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff"))
+_TABULAR_EXTS = frozenset((".csv", ".tsv"))
+
 
+def _scan_input_dir(input_dir: Path) -> tuple[dict[str, int], list[Path], list[Path]]:
+    """
+    Walk input_dir once and return (extension counts, image files, tabular files).
+    """
+    exts: dict[str, int] = {}
+    imgs: list[Path] = []
+    tabs: list[Path] = []
+    stack = [os.fspath(input_dir)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for e in entries:
+            # DirEntry caches the dirent type, so these checks avoid an extra stat per entry.
+            if e.is_dir(follow_symlinks=False):
+                stack.append(e.path)
+                continue
+            if not e.is_file():
+                continue
+            name = e.name
+            dot = name.rfind(".")
+            # Same rules as Path.suffix: no suffix for dotfiles or a trailing dot.
+            ext = name[dot:].lower() if 0 < dot < len(name) - 1 else ""
+            key = ext or "<none>"
+            exts[key] = exts.get(key, 0) + 1
+            if ext in _IMAGE_EXTS:
+                imgs.append(Path(e.path))
+            elif ext in _TABULAR_EXTS:
+                tabs.append(Path(e.path))
+    return exts, imgs, tabs
+
+
+def _read_csv_head(path: Path, *, sep: str, nrows: int):  # type: ignore[no-untyped-def]
+    """
+    Read the first `nrows` rows of a CSV/TSV.
+    Uses pyarrow's streaming reader when available (only the first blocks are parsed), else pandas.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except Exception:
+        return pd.read_csv(path, sep=sep, nrows=nrows)
+
+    try:
+        reader = pacsv.open_csv(
+            path.as_posix(),
+            read_options=pacsv.ReadOptions(block_size=1 << 16),
+            parse_options=pacsv.ParseOptions(delimiter=sep),
+        )
+        try:
+            batches = []
+            n = 0
+            while n < nrows:
+                try:
+                    batch = reader.read_next_batch()
+                except StopIteration:
+                    break
+                batches.append(batch)
+                n += batch.num_rows
+            table = pa.Table.from_batches(batches, schema=reader.schema)
+        finally:
+            reader.close()
+        return table.slice(0, nrows).to_pandas()
+    except Exception:
+        # Type inference is per-block in the streaming reader; fall back to pandas on any mismatch.
+        return pd.read_csv(path, sep=sep, nrows=nrows)
+
+
+def _is_blank_str(v: Any) -> bool:
+    return isinstance(v, str) and not v.strip()
+
+
+def _missing_table(df):  # type: ignore[no-untyped-def]
     total = int(len(df))
-    rows: list[dict[str, object]] = []
-    for c in df.columns:
-        s = df[c]
-        missing = s.isna()
-        # Treat empty strings as missing (after stripping)
+    missing = df.isna()
+    # Treat empty strings as missing (after stripping); only text columns can hold them.
+    text_cols = df.select_dtypes(include=["object", "string"]).columns
+    if len(text_cols) > 0:
         try:
-            missing = missing | (s.astype(str).str.strip() == "")
+            values = df[text_cols].to_numpy(dtype=object)
+            blank = np.frompyfunc(_is_blank_str, 1, 1)(values).astype(bool)
+            missing[text_cols] = missing[text_cols].to_numpy() | blank
         except Exception:
             pass
-        m = int(missing.sum())
-        rows.append(
-            {
-                "column": str(c),
-                "total": total,
-                "missing": m,
-                "filled": int(total - m),
-                "missing_rate": (float(m) / float(total)) if total else 0.0,
-            }
-        )
-    out = pd.DataFrame(rows)
+    m = missing.sum(axis=0).to_numpy(dtype="int64")
+    out = pd.DataFrame(
+        {
+            "column": [str(c) for c in df.columns],
+            "total": total,
+            "missing": m,
+            "filled": total - m,
+            "missing_rate": (m / float(total)) if total else 0.0,
+        }
+    )
     if not out.empty:
         out = out.sort_values(["missing_rate", "missing", "column"], ascending=[False, False, True])
     return out
 
 
 def _report_numeric_stats(logger: Any, *, title: str, series_prefix: str, df):  # type: ignore[no-untyped-def]
-    import pandas as pd
-
-    rows: list[dict[str, object]] = []
-    for c in df.columns:
-        s0 = df[c]
-        s = pd.to_numeric(s0, errors="coerce")
-        n = int(s.notna().sum())
-        if n == 0:
-            continue
-        rows.append(
-            {
-                "column": str(c),
-                "count": n,
-                "mean": float(s.mean()),
-                "std": float(s.std(ddof=0)),
-                "min": float(s.min()),
-                "p50": float(s.quantile(0.5)),
-                "max": float(s.max()),
-            }
-        )
-
-        if hasattr(logger, "report_histogram"):
-            vals = s.dropna()
-            if len(vals) > 20000:
-                vals = vals.sample(20000, random_state=0)
-            if len(vals) > 0:
-                logger.report_histogram(title, f"{series_prefix}/{c}", values=vals.tolist(), iteration=0)
-
-    if rows and hasattr(logger, "report_table"):
-        out = pd.DataFrame(rows).sort_values(["column"])
+    if len(df.columns) == 0:
+        return
+    # In-memory frames may carry datetime columns; CSV round-trips never do, so skip them for parity.
+    df = df.select_dtypes(exclude=["datetime", "datetimetz"])
+    if len(df.columns) == 0:
+        return
+    num = df.apply(pd.to_numeric, errors="coerce").astype("float64")
+    stats = pd.DataFrame(
+        {
+            "column": [str(c) for c in num.columns],
+            "count": num.count().to_numpy(dtype="int64"),
+            "mean": num.mean().to_numpy(),
+            "std": num.std(ddof=0).to_numpy(),
+            "min": num.min().to_numpy(),
+            "p50": num.median().to_numpy(),
+            "max": num.max().to_numpy(),
+        }
+    )
+    has_values = stats["count"].to_numpy() > 0
+
+    if hasattr(logger, "report_histogram"):
+        rng = np.random.default_rng(0)
+        for pos in has_values.nonzero()[0]:
+            vals = num.iloc[:, pos].to_numpy()
+            vals = vals[~np.isnan(vals)]
+            if vals.size > 20000:
+                vals = rng.choice(vals, 20000, replace=False)
+            logger.report_histogram(title, f"{series_prefix}/{num.columns[pos]}", values=vals, iteration=0)
+
+    out = stats[has_values]
+    if not out.empty and hasattr(logger, "report_table"):
+        out = out.sort_values(["column"])
         logger.report_table(title, f"{series_prefix}_numeric", iteration=0, table_plot=out)
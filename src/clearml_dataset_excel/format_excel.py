@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
 import shutil
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
 from .format_spec import DatasetFormatSpec
@@ -9,6 +13,40 @@ from . import __version__ as _ADDIN_VERSION
 from .utils import clear_macos_quarantine
 
 
+@lru_cache(maxsize=256)
+def _xlsm_contains_vba_cached(path_str: str, mtime_ns: int, size: int) -> bool:
+    try:
+        import zipfile
+
+        with zipfile.ZipFile(path_str, "r") as z:
+            return "xl/vbaProject.bin" in z.NameToInfo
+    except Exception:
+        return False
+
+
+def _xlsm_contains_vba(excel_path: Path) -> bool:
+    """
+    Return True if the workbook zip contains a VBA project (xl/vbaProject.bin).
+
+    Results are cached per (path, mtime, size), so repeated checks of an unchanged file skip the zip open.
+    """
+    try:
+        st = os.stat(excel_path)
+    except OSError:
+        return False
+    return _xlsm_contains_vba_cached(os.fspath(excel_path), st.st_mtime_ns, st.st_size)
+
+
+def _needs_keep_vba(excel_path: Path, *, has_vba: bool) -> bool:
+    """
+    Whether openpyxl must load `excel_path` with keep_vba=True.
+
+    keep_vba also decides the workbook content type on save, so macro-enabled extensions always need it
+    (an .xlsm saved with the plain .xlsx content type does not open in Excel).
+    """
+    return has_vba or excel_path.suffix.lower() in {".xlsm", ".xltm", ".xlam"}
+
+
 def _repair_vba_metadata_if_present(excel_path: Path) -> None:
     """
     Best-effort: repair OOXML metadata required for VBA projects.
@@ -16,13 +54,7 @@ def _repair_vba_metadata_if_present(excel_path: Path) -> None:
     Some writers (notably openpyxl keep_vba=True) can drop the vbaProject override from
     [Content_Types].xml, which may cause Excel to show an empty macro list.
     """
-    try:
-        import zipfile
-
-        with zipfile.ZipFile(excel_path, "r") as z:
-            if "xl/vbaProject.bin" not in set(z.namelist()):
-                return
-    except Exception:
+    if not _xlsm_contains_vba(excel_path):
         return
 
     try:
@@ -49,14 +81,69 @@ def _excel_number_format(dtype: str) -> str | None:
     return None
 
 
+@lru_cache(maxsize=1)
+def _header_styles():  # type: ignore[no-untyped-def]
+    """
+    Conditions header styles (font, fill, required fill, alignment).
+
+    openpyxl style objects are immutable, so they are built once per process and shared.
+    """
+    from openpyxl.styles import Alignment, Font, PatternFill
+
+    return (
+        Font(bold=True, color="FFFFFF"),
+        PatternFill("solid", fgColor="4F81BD"),
+        PatternFill("solid", fgColor="C00000"),
+        Alignment(horizontal="center", vertical="center", wrap_text=True),
+    )
+
+
+def _template_signature(base: Path, spec: DatasetFormatSpec, *, clear_conditions_data: bool) -> str:
+    """Digest of everything generate_condition_template_from_excel's output depends on."""
+    st = base.stat()
+    payload = [base.as_posix(), st.st_mtime_ns, st.st_size, repr(spec), _ADDIN_VERSION, clear_conditions_data]
+    return hashlib.blake2b(json.dumps(payload).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _template_is_up_to_date(out: Path, sig_path: Path, signature: str) -> bool:
+    """True if `sig_path` records `signature` and `out` is unchanged since it was written."""
+    try:
+        recorded = json.loads(sig_path.read_text(encoding="utf-8"))
+        st = out.stat()
+    except Exception:
+        return False
+    return isinstance(recorded, dict) and recorded == {
+        "signature": signature,
+        "output": [st.st_mtime_ns, st.st_size],
+    }
+
+
+def _write_template_signature(out: Path, sig_path: Path, signature: str) -> None:
+    try:
+        st = out.stat()
+        sig_path.write_text(
+            json.dumps({"signature": signature, "output": [st.st_mtime_ns, st.st_size]}), encoding="utf-8"
+        )
+    except Exception:
+        # Best-effort: without a signature the next run simply regenerates.
+        pass
+
+
+def _meta_command(command: str | None) -> str:
+    # Store one placeholder style (${SPEC}/${EXCEL}) so the add-in macros only substitute once per placeholder.
+    cmd = command or ""
+    if "${{" in cmd:
+        cmd = cmd.replace("${{SPEC}}", "${SPEC}").replace("${{EXCEL}}", "${EXCEL}")
+    return cmd
+
+
 def _populate_template_workbook(
     wb,  # type: ignore[no-untyped-def]
     spec: DatasetFormatSpec,
     *,
     clear_conditions_data: bool,
 ) -> None:
-    import openpyxl
-    from openpyxl.styles import Alignment, Font, PatternFill
+    from openpyxl.utils import get_column_letter
 
     info_ws = wb["Info"] if "Info" in wb.sheetnames else wb.create_sheet("Info")
     cond_ws = (
@@ -117,11 +204,11 @@ def _populate_template_workbook(
     meta_ws["A5"].value = "addin_spec_filename"
     meta_ws["B5"].value = spec.addin.spec_filename or ""
     meta_ws["A6"].value = "addin_command"
-    meta_ws["B6"].value = spec.addin.command or ""
+    meta_ws["B6"].value = _meta_command(spec.addin.command)
     meta_ws["A7"].value = "addin_command_mac"
-    meta_ws["B7"].value = spec.addin.command_mac or ""
+    meta_ws["B7"].value = _meta_command(spec.addin.command_mac)
     meta_ws["A8"].value = "addin_command_windows"
-    meta_ws["B8"].value = spec.addin.command_windows or ""
+    meta_ws["B8"].value = _meta_command(spec.addin.command_windows)
     meta_ws["A9"].value = "addin_windows_mode"
     meta_ws["B9"].value = spec.addin.windows_mode
     meta_ws["A10"].value = "addin_windows_template_filename"
@@ -134,10 +221,7 @@ def _populate_template_workbook(
     meta_ws.sheet_state = "hidden"
 
     # Conditions header row
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill("solid", fgColor="4F81BD")
-    required_fill = PatternFill("solid", fgColor="C00000")
-    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    header_font, header_fill, required_fill, header_alignment = _header_styles()
 
     cond_ws.freeze_panes = "A2"
     if clear_conditions_data and cond_ws.max_row > 1:
@@ -146,6 +230,7 @@ def _populate_template_workbook(
     names = [c.name for c in spec.condition_columns]
     max_existing = int(cond_ws.max_column or 0)
     max_cols = max(max_existing, len(names))
+    letters = [get_column_letter(i) for i in range(1, max_cols + 1)]
     for col_idx in range(1, max_cols + 1):
         cell = cond_ws.cell(row=1, column=col_idx)
         if col_idx <= len(names):
@@ -163,27 +248,35 @@ def _populate_template_workbook(
         width = max(12, min(40, len(col.name) + 2))
         if col.dtype.lower().strip() in {"path", "str", "string"} or col.name.lower().endswith("_path"):
             width = max(width, 28)
-        cond_ws.column_dimensions[openpyxl.utils.get_column_letter(col_idx)].width = width
+        cond_ws.column_dimensions[letters[col_idx - 1]].width = width
 
     # Optional: add data validation for enum/bool
     try:
         from openpyxl.worksheet.datavalidation import DataValidation
 
+        # Columns sharing the same list + allow_blank share one <dataValidation> node (one range per column).
+        dv_groups: dict[tuple[str, bool], DataValidation] = {}
         for col_idx, col in enumerate(spec.condition_columns, start=1):
             dt = col.dtype.lower().strip()
             if dt in {"bool", "boolean"}:
-                dv = DataValidation(type="list", formula1='"TRUE,FALSE"', allow_blank=not col.required)
-                cond_ws.add_data_validation(dv)
-                dv.add(f"{openpyxl.utils.get_column_letter(col_idx)}2:{openpyxl.utils.get_column_letter(col_idx)}1048576")
+                formula1 = '"TRUE,FALSE"'
             elif col.enum:
                 # Excel list validation has length limits; keep it simple for now.
                 items = ",".join([x.replace(",", " ") for x in col.enum])
-                if 1 <= len(items) <= 200:
-                    dv = DataValidation(type="list", formula1=f'"{items}"', allow_blank=not col.required)
-                    cond_ws.add_data_validation(dv)
-                    dv.add(
-                        f"{openpyxl.utils.get_column_letter(col_idx)}2:{openpyxl.utils.get_column_letter(col_idx)}1048576"
-                    )
+                if not 1 <= len(items) <= 200:
+                    continue
+                formula1 = f'"{items}"'
+            else:
+                continue
+            allow_blank = not col.required
+            dv = dv_groups.get((formula1, allow_blank))
+            if dv is None:
+                dv = dv_groups[(formula1, allow_blank)] = DataValidation(
+                    type="list", formula1=formula1, allow_blank=allow_blank
+                )
+            dv.add(f"{letters[col_idx - 1]}2:{letters[col_idx - 1]}1048576")
+        for dv in dv_groups.values():
+            cond_ws.add_data_validation(dv)
     except Exception:
         # Data validation is optional; do not fail template generation.
         pass
@@ -196,15 +289,24 @@ def generate_condition_template_from_excel(
     *,
     overwrite: bool = False,
     clear_conditions_data: bool = True,
+    signature_path: str | Path | None = None,
 ) -> Path:
     """
     Generate a condition Excel template by copying an existing workbook (preserves VBA if present).
+
+    With `signature_path`, a digest of the inputs is recorded there after generating; an existing output whose
+    recorded digest still matches is returned as is instead of raising FileExistsError.
     """
     base = Path(base_excel).expanduser().resolve()
     out = Path(output_path).expanduser().resolve()
     if not base.exists():
         raise FileNotFoundError(f"Base Excel not found: {base}")
+    sig_path = Path(signature_path).expanduser().resolve() if signature_path is not None and base != out else None
+    signature = _template_signature(base, spec, clear_conditions_data=clear_conditions_data) if sig_path is not None else ""
     if out.exists() and not overwrite:
+        # Re-running with the same base/spec: the existing output is already what we would generate.
+        if sig_path is not None and _template_is_up_to_date(out, sig_path, signature):
+            return out
         raise FileExistsError(f"Output already exists: {out}")
 
     try:
@@ -216,11 +318,17 @@ def generate_condition_template_from_excel(
     if base.resolve() != out.resolve():
         shutil.copy2(base, out)
 
-    wb = openpyxl.load_workbook(out, keep_vba=True)
+    # keep_vba=True makes openpyxl copy the source archive; only pay for it when it matters.
+    has_vba = _xlsm_contains_vba(out)
+    wb = openpyxl.load_workbook(out, keep_vba=_needs_keep_vba(out, has_vba=has_vba))
     _populate_template_workbook(wb, spec, clear_conditions_data=clear_conditions_data)
     wb.save(out)
-    _repair_vba_metadata_if_present(out)
+    if has_vba:
+        # Saving cannot add a VBA project, so there is nothing to repair without one.
+        _repair_vba_metadata_if_present(out)
     clear_macos_quarantine(out)
+    if sig_path is not None:
+        _write_template_signature(out, sig_path, signature)
     return out
 
 
@@ -245,7 +353,12 @@ def annotate_template_with_clearml_info(
     except Exception:  # pragma: no cover
         return
 
-    wb = openpyxl.load_workbook(path, keep_vba=True)
+    # Skip keep_vba (which retains a copy of the source archive) for plain .xlsx workbooks without VBA.
+    # keep_links stays on: the workbook is saved back, and keep_links=False would drop its external links.
+    # read_only=True is not an option here either since the workbook is saved back; it would also make
+    # ws.max_row / ws.max_column unreliable (they come from the sheet's dimension record).
+    has_vba = _xlsm_contains_vba(path)
+    wb = openpyxl.load_workbook(path, keep_vba=_needs_keep_vba(path, has_vba=has_vba))
     try:
         if "Info" not in wb.sheetnames:
             return
@@ -278,7 +391,8 @@ def annotate_template_with_clearml_info(
                 vba_archive.close()
         except Exception:
             pass
-    _repair_vba_metadata_if_present(path)
+    if has_vba:
+        _repair_vba_metadata_if_present(path)
     clear_macos_quarantine(path)
 
 
@@ -1,9 +1,19 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Any, Mapping
 
+try:
+    import numpy as np
+    import pandas as pd
+except Exception:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+    pd = None  # type: ignore[assignment]
+
 from .expr import ExprError, eval_expr
 from .format_spec import Aggregate, DatasetFormatSpec, FileSpec
 from .manifest import read_rows_from_manifest
@@ -22,52 +32,86 @@ class ProcessOutputs:
     consolidated_excel: Path
     uploaded_files: list[Path]
     raw_path_map: dict[str, Path]
+    # In-memory copies of conditions_csv/canonical_csv (lets callers skip re-reading the CSVs).
+    conditions_df: Any = field(default=None, repr=False, compare=False)
+    canonical_df: Any = field(default=None, repr=False, compare=False)
+
+    def frames(self) -> dict[str, Any]:
+        out: dict[str, Any] = {}
+        if self.conditions_df is not None:
+            out["conditions"] = self.conditions_df
+        if self.canonical_df is not None:
+            out["canonical"] = self.canonical_df
+        return out
+
+
+_BOOL_TEXT = {
+    "true": True,
+    "t": True,
+    "1": True,
+    "yes": True,
+    "y": True,
+    "false": False,
+    "f": False,
+    "0": False,
+    "no": False,
+    "n": False,
+}
+# 1/0 and 1.0/0.0 hash (and compare) equal to True/False, so this also covers numeric flags.
+_BOOL_VALUE = {True: True, False: False}
+
+
+def _coerce_str_series(series):  # type: ignore[no-untyped-def]
+    """None stays None, everything else becomes str(v) (NaN -> "nan", as before)."""
+    obj = series.astype(object)
+    out = obj.astype(str).to_numpy(dtype=object)
+    out[obj.to_numpy() == None] = None  # noqa: E711 (elementwise identity check against None)
+    return type(series)(out, index=series.index, name=series.name, dtype=object)
+
+
+def _coerce_bool_series(series):  # type: ignore[no-untyped-def]
+    """Map bool-like values to True/False and anything else to None."""
+    obj = series.astype(object)
+    out = obj.map(_BOOL_VALUE).to_numpy(dtype=object)
+    try:
+        text = obj.str.strip().str.lower()  # non-strings become NaN
+    except AttributeError:
+        # .str is unavailable when the column holds no strings at all.
+        text = None
+    if text is not None:
+        from_text = text.map(_BOOL_TEXT).to_numpy(dtype=object)
+        hit = pd.notna(from_text)
+        out[hit] = from_text[hit]
+    out[pd.isna(out)] = None
+    # A column without missing values comes back as plain bool dtype (as Series.apply would infer).
+    return pd.Series(out, index=series.index, name=series.name, dtype=object).infer_objects()
 
 
 def _coerce_condition_series(series, dtype: str):  # type: ignore[no-untyped-def]
-    import pandas as pd
-
     dt = dtype.lower().strip()
     if dt in {"str", "string", "path"}:
-        return series.apply(lambda v: None if v is None else str(v))
+        return _coerce_str_series(series)
     if dt in {"int", "int64", "integer"}:
         return pd.to_numeric(series, errors="coerce").astype("Int64")
     if dt in {"float", "float64", "number"}:
         return pd.to_numeric(series, errors="coerce").astype("Float64")
     if dt in {"bool", "boolean"}:
-        def _to_bool(v: Any) -> bool | None:
-            if v is None:
-                return None
-            if isinstance(v, bool):
-                return v
-            if isinstance(v, (int, float)) and v in (0, 1):
-                return bool(v)
-            if isinstance(v, str):
-                s = v.strip().lower()
-                if s in {"true", "t", "1", "yes", "y"}:
-                    return True
-                if s in {"false", "f", "0", "no", "n"}:
-                    return False
-            return None
-
-        return series.apply(_to_bool)
+        return _coerce_bool_series(series)
     if dt in {"date", "datetime"}:
         return pd.to_datetime(series, errors="coerce")
     return series
 
 
 def _coerce_measure_series(series, dtype: str):  # type: ignore[no-untyped-def]
-    import pandas as pd
-
     dt = dtype.lower().strip()
     if dt in {"str", "string"}:
-        return series.apply(lambda v: None if v is None else str(v))
+        return _coerce_str_series(series)
     if dt in {"int", "int64", "integer"}:
         return pd.to_numeric(series, errors="coerce").astype("Int64")
     if dt in {"float", "float64", "number"}:
         return pd.to_numeric(series, errors="coerce").astype("Float64")
     if dt in {"bool", "boolean"}:
-        return _coerce_condition_series(series, "bool")
+        return _coerce_bool_series(series)
     if dt in {"date", "datetime"}:
         return pd.to_datetime(series, errors="coerce")
     return series
@@ -80,6 +124,44 @@ def _resolve_local_path(text: str, *, base_dir: Path) -> Path:
     return (base_dir / expanded).resolve()
 
 
+@lru_cache(maxsize=8)
+def _index_tree(root: Path) -> tuple[dict[str, list[Path]], dict[str, list[Path]]]:
+    """
+    Walk `root` once and index its files for basename lookups.
+
+    Returns (by_name, by_suffix): by_name maps a file name to its paths; by_suffix maps every
+    text following an underscore in a name (so `000_a_b.csv` -> `a_b.csv` and `b.csv`), which is
+    what the `*_<basename>` glob used to match. Keys go through os.path.normcase, and symlinked
+    directories are not descended into (both as with Path.rglob).
+    """
+    by_name: dict[str, list[Path]] = {}
+    by_suffix: dict[str, list[Path]] = {}
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+                name = os.path.normcase(entry.name)
+                p = Path(entry.path)
+                by_name.setdefault(name, []).append(p)
+                pos = name.find("_")
+                while pos != -1:
+                    by_suffix.setdefault(name[pos + 1 :], []).append(p)
+                    pos = name.find("_", pos + 1)
+    return by_name, by_suffix
+
+
 def _fallback_resolve_missing_path(*, raw_path: str, search_root: Path) -> Path | None:
     """
     Best-effort path resolution when the path stored in Excel does not exist locally.
@@ -104,12 +186,9 @@ def _fallback_resolve_missing_path(*, raw_path: str, search_root: Path) -> Path
     if not basename:
         return None
 
-    patterns = [basename, f"*_{basename}"]
-    matches: list[Path] = []
-    for pat in patterns:
-        for p in search_root.rglob(pat):
-            if p.is_file():
-                matches.append(p.resolve())
+    by_name, by_suffix = _index_tree(search_root)
+    key = os.path.normcase(basename)
+    matches = [p.resolve() for p in by_name.get(key, []) + by_suffix.get(key, [])]
 
     unique: list[Path] = []
     seen: set[str] = set()
@@ -124,74 +203,129 @@ def _fallback_resolve_missing_path(*, raw_path: str, search_root: Path) -> Path
     return None
 
 
-def _read_measurement_file(path: Path, file_spec: FileSpec):  # type: ignore[no-untyped-def]
-    import pandas as pd
+def _source_columns(file_spec: FileSpec) -> list[str]:
+    """Raw columns _normalize_measurement_df reads (axes + target sources), in first-use order."""
+    cols = [getattr(file_spec.axes, axis) for axis in ("x", "y", "z", "t")]
+    cols.extend(t.source for t in file_spec.targets)
+    return list(dict.fromkeys(c for c in cols if c is not None))
 
+
+def _read_projected(reader, path: Path, opts: dict[str, Any], columns: list[str]):  # type: ignore[no-untyped-def]
+    """
+    Call `reader` parsing only `columns`, unless the spec's read options already pick columns.
+
+    Falls back to a full read when the projection does not apply (e.g. a source column is missing or
+    header/names options renamed the columns), so missing-column errors keep coming from normalization.
+    """
+    if columns and "usecols" not in opts:
+        try:
+            return reader(path, usecols=columns, **opts)
+        except ValueError:
+            pass
+    return reader(path, **opts)
+
+
+def _read_measurement_file(path: Path, file_spec: FileSpec):  # type: ignore[no-untyped-def]
     fmt = file_spec.format.lower().strip()
     if fmt in {"csv", "tsv"}:
         sep = "\t" if fmt == "tsv" else ","
         opts = dict(file_spec.read)
         opts.setdefault("sep", sep)
-        return pd.read_csv(path, **opts)
+        return _read_projected(pd.read_csv, path, opts, _source_columns(file_spec))
     if fmt in {"xlsx", "xlsm", "xls", "excel"}:
         opts = dict(file_spec.read)
         if file_spec.sheet:
             opts.setdefault("sheet_name", file_spec.sheet)
-        return pd.read_excel(path, engine="openpyxl", engine_kwargs={"data_only": True}, **opts)
+        reader = partial(pd.read_excel, engine="openpyxl", engine_kwargs={"read_only": True, "data_only": True})
+        return _read_projected(reader, path, opts, _source_columns(file_spec))
     if fmt in {"image", "jpg", "jpeg", "png", "tif", "tiff", "bmp"}:
         return None
     raise ProcessingError(f"Unsupported format for {file_spec.file_id}: {file_spec.format}")
 
 
-def _normalize_measurement_df(df, file_spec: FileSpec):  # type: ignore[no-untyped-def]
-    import pandas as pd
+def _load_measurement(item: tuple[FileSpec, Path]):  # type: ignore[no-untyped-def]
+    file_spec, path = item
+    return _normalize_measurement_df(_read_measurement_file(path, file_spec), file_spec)
+
 
+def _map_parallel(fn, items: list[Any]) -> list[Any]:  # type: ignore[no-untyped-def]
+    """Ordered map over a thread pool (inline for 0/1 items); the first exception is re-raised."""
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    workers = min(32, (os.cpu_count() or 1) * 4, len(items))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(fn, items))
+
+
+def _na_to_none(series):  # type: ignore[no-untyped-def]
+    """Missing values in object columns become None; typed columns already hold NaN/NaT and pass through."""
+    if series.dtype != object:
+        return series
+    return series.where(series.notna(), None)
+
+
+def _normalize_measurement_df(df, file_spec: FileSpec):  # type: ignore[no-untyped-def]
     if df is None:
         return None
 
-    df = df.where(df.notnull(), None)
-
-    out = pd.DataFrame()
+    # Columns are collected in a dict and turned into a frame once (no per-column BlockManager inserts).
+    # Without any source column the result has no rows (as before).
+    has_source = bool(file_spec.targets) or any(
+        getattr(file_spec.axes, axis) is not None for axis in ("x", "y", "z", "t")
+    )
+    index = df.index if has_source else pd.RangeIndex(0)
+    cols: dict[str, Any] = {}
     for axis in ("x", "y", "z", "t"):
         src = getattr(file_spec.axes, axis)
         dtype = getattr(file_spec.axis_types, axis, None)
         if src is None:
-            out[axis] = pd.NA
+            cols[axis] = pd.Series(pd.NA, index=index, dtype=object)
         else:
             if src not in df.columns:
                 raise ProcessingError(f"{file_spec.file_id}: missing axis column in file: {src}")
-            s = df[src]
+            s = _na_to_none(df[src])
             if isinstance(dtype, str) and dtype.strip():
-                out[axis] = _coerce_measure_series(s, dtype)
+                cols[axis] = _coerce_measure_series(s, dtype)
             else:
-                out[axis] = s
+                cols[axis] = s
 
     for t in file_spec.targets:
         if t.source not in df.columns:
             raise ProcessingError(f"{file_spec.file_id}: missing target source column in file: {t.source}")
-        out[t.name] = _coerce_measure_series(df[t.source], t.dtype)
+        cols[t.name] = _coerce_measure_series(_na_to_none(df[t.source]), t.dtype)
 
     # Derived columns evaluated on canonical namespace (axes + targets + previous derived)
     for d in file_spec.derived:
-        namespace = {k: out[k] for k in out.columns}
         try:
-            v = eval_expr(d.expr, namespace)
+            v = eval_expr(d.expr, dict(cols))
         except ExprError as e:
             raise ProcessingError(f"{file_spec.file_id}: derived '{d.name}' failed: {e}") from e
-        out[d.name] = _coerce_measure_series(v, d.dtype)  # type: ignore[arg-type]
+        v = _coerce_measure_series(v, d.dtype)  # type: ignore[arg-type]
+        cols[d.name] = v if isinstance(v, pd.Series) else pd.Series(v, index=index)
 
-    return out
+    return pd.DataFrame(cols, index=index)
 
 
-def _compute_aggregate(df, agg: Aggregate):  # type: ignore[no-untyped-def]
-    import numpy as np
-    import pandas as pd
+def _compute_aggregate(df, agg: Aggregate, *, numeric: dict[str, Any] | None = None):  # type: ignore[no-untyped-def]
+    """
+    Compute one aggregate over `df`.
 
+    `numeric` optionally caches pd.to_numeric conversions by column name, so several aggregates over the
+    same frame convert each source/wrt column only once.
+    """
     if agg.source not in df.columns:
         raise ProcessingError(f"aggregate '{agg.name}': unknown source column: {agg.source}")
 
+    def _numeric(col: str):  # type: ignore[no-untyped-def]
+        if numeric is None:
+            return pd.to_numeric(df[col], errors="coerce")
+        conv = numeric.get(col)
+        if conv is None:
+            conv = numeric[col] = pd.to_numeric(df[col], errors="coerce")
+        return conv
+
     op = agg.op.lower().strip()
-    s = pd.to_numeric(df[agg.source], errors="coerce")
+    s = _numeric(agg.source)
 
     if op == "mean":
         return float(s.mean())
@@ -205,20 +339,48 @@ def _compute_aggregate(df, agg: Aggregate):  # type: ignore[no-untyped-def]
         wrt = agg.wrt or "t"
         if wrt not in df.columns:
             raise ProcessingError(f"aggregate '{agg.name}': wrt column not found: {wrt}")
-        x = pd.to_numeric(df[wrt], errors="coerce").to_numpy(dtype=float)
+        x = _numeric(wrt).to_numpy(dtype=float)
         y = s.to_numpy(dtype=float)
         mask = ~(np.isnan(x) | np.isnan(y))
         if int(mask.sum()) < 2:
             return float("nan")
         x2 = x[mask]
         y2 = y[mask]
-        order = np.argsort(x2)
-        trapezoid = getattr(np, "trapezoid", np.trapz)
-        return float(trapezoid(y2[order], x2[order]))
+        # Measurement axes are usually already sorted; only sort when they are not. The order of tied x values does
+        # matter (x=[0, 1, 1, 3], y=[0, 2, 4, 0] gives 5, or 4 with the tied points swapped): skipping the sort is only
+        # valid because it keeps ties in input order, and the sort is stable so it does the same.
+        if not bool(np.all(np.diff(x2) >= 0)):
+            order = np.argsort(x2, kind="stable")
+            x2 = x2[order]
+            y2 = y2[order]
+        trapezoid = getattr(np, "trapezoid", None) or np.trapz  # numpy<2.0 only has trapz
+        return float(trapezoid(y2, x2))
 
     raise ProcessingError(f"aggregate '{agg.name}': unsupported op: {agg.op}")
 
 
+def _write_consolidated_excel(path: Path, sheets: list[tuple[str, Any]]) -> None:
+    """
+    Write DataFrames as plain sheets via openpyxl's write-only (streaming) mode.
+    Cells are not kept in memory and no header styling is applied; NA values become empty cells.
+    """
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    for sheet_name, df in sheets:
+        ws = wb.create_sheet(title=sheet_name)
+        ws.append([str(c) for c in df.columns])
+        columns = []
+        for i in range(len(df.columns)):
+            col = df.iloc[:, i]
+            values = col.to_numpy(dtype=object, copy=True)
+            values[col.isna().to_numpy()] = None
+            columns.append(values)
+        for row in zip(*columns):
+            ws.append(row)
+    wb.save(path)
+
+
 def process_condition_excel(
     spec: DatasetFormatSpec,
     excel_path: str | Path,
@@ -235,11 +397,14 @@ def process_condition_excel(
     - canonical.csv (long table with x/y/z/t and all targets)
     - consolidated.xlsx (Conditions + Canonical sheets)
     """
-    import pandas as pd
+    if pd is None:  # pragma: no cover
+        raise RuntimeError("Processing condition Excel requires 'pandas'. Install dependencies first.")
 
     excel_path = Path(excel_path).expanduser().resolve()
     if not excel_path.exists():
         raise ProcessingError(f"Condition Excel not found: {excel_path}")
+    # The fallback search index is per run; the tree may have changed since a previous call.
+    _index_tree.cache_clear()
 
     rows, _ = read_rows_from_manifest(excel_path, sheet_name or spec.template.condition_sheet)
     cond_df = pd.DataFrame(rows)
@@ -253,11 +418,17 @@ def process_condition_excel(
     # Coerce and validate required columns
     for c in spec.condition_columns:
         cond_df[c.name] = _coerce_condition_series(cond_df[c.name], c.dtype)
-        if c.required:
-            missing_mask = cond_df[c.name].isna() | (cond_df[c.name].astype(str).str.strip() == "")
+    required_names = [c.name for c in spec.condition_columns if c.required]
+    if required_names:
+        # One mask for all required columns: missing, or a string that is blank after strip().
+        req = cond_df[required_names]
+        blank = req.apply(lambda s: s.astype("string").str.strip().eq("").fillna(False))
+        missing_df = req.isna() | blank
+        for name in required_names:
+            missing_mask = missing_df[name]
             if bool(missing_mask.any()):
                 bad_rows = missing_mask[missing_mask].index.to_list()[:20]
-                raise ProcessingError(f"Required column '{c.name}' has missing values at rows: {bad_rows}")
+                raise ProcessingError(f"Required column '{name}' has missing values at rows: {bad_rows}")
 
     output_root_path = Path(output_root).expanduser().resolve() if output_root else excel_path.parent
     output_dir = output_root_path / spec.output.output_dirname
@@ -277,11 +448,16 @@ def process_condition_excel(
     uploaded_files: list[Path] = [excel_path]
     raw_path_map: dict[str, Path] = {}
 
-    for row_idx, row in cond_df.iterrows():
-        row_dict = row.to_dict()
+    # Aggregates are collected per column (one slot per row) and attached once after the loop.
+    unset = object()
+    agg_values: dict[str, list[Any]] = {}
+    cond_columns = list(cond_df.columns)
 
-        per_file_frames: list[tuple[FileSpec, pd.DataFrame]] = []
-        per_row_aggs: dict[str, Any] = {}
+    # Pass 1: resolve the referenced files of every row (in row order, so errors name the first bad row).
+    row_items: list[tuple[Any, dict[str, Any], list[tuple[FileSpec, Path]]]] = []
+    for row_idx, *row_values in cond_df.itertuples(index=True, name=None):
+        row_dict = dict(zip(cond_columns, row_values))
+        row_files: list[tuple[FileSpec, Path]] = []
 
         for f in spec.files:
             raw_path = row_dict.get(f.path_column)
@@ -293,57 +469,84 @@ def process_condition_excel(
             if is_url(raw_path):
                 raise ProcessingError(f"Row {row_idx}: URL paths are not supported (upload-all required): {raw_path}")
 
-            resolved = _resolve_local_path(raw_path, base_dir=excel_path.parent)
-            if check_files_exist and not resolved.exists():
-                if path_fallback_map is not None:
-                    alt_text = path_fallback_map.get(raw_path)
-                    if alt_text is None:
-                        alt_text = path_fallback_map.get(raw_path.replace("\\", "/"))
-                    if alt_text is None:
-                        alt_text = path_fallback_map.get(raw_path.replace("/", "\\"))
-                    if isinstance(alt_text, str) and alt_text.strip():
-                        alt_path = Path(alt_text).expanduser()
-                        if not alt_path.is_absolute():
-                            alt_path = (excel_path.parent / alt_path).resolve()
-                        else:
-                            alt_path = alt_path.resolve()
-                        if alt_path.exists():
-                            resolved = alt_path
-                if fallback_root_path is not None:
-                    alt = _fallback_resolve_missing_path(raw_path=raw_path, search_root=fallback_root_path)
-                    if alt is not None and alt.exists():
-                        resolved = alt
-                if not resolved.exists():
-                    raise ProcessingError(f"Row {row_idx}: file not found for column '{f.path_column}': {resolved}")
-            prev = raw_path_map.get(raw_path)
-            if prev is None:
+            # Each distinct path string is resolved once (resolve() and the fallbacks stat the filesystem);
+            # later rows reuse the result, so a value always maps to the same file within a run.
+            resolved = raw_path_map.get(raw_path)
+            if resolved is None:
+                resolved = _resolve_local_path(raw_path, base_dir=excel_path.parent)
+                if check_files_exist and not resolved.exists():
+                    if path_fallback_map is not None:
+                        alt_text = path_fallback_map.get(raw_path)
+                        if alt_text is None:
+                            alt_text = path_fallback_map.get(raw_path.replace("\\", "/"))
+                        if alt_text is None:
+                            alt_text = path_fallback_map.get(raw_path.replace("/", "\\"))
+                        if isinstance(alt_text, str) and alt_text.strip():
+                            alt_path = Path(alt_text).expanduser()
+                            if not alt_path.is_absolute():
+                                alt_path = (excel_path.parent / alt_path).resolve()
+                            else:
+                                alt_path = alt_path.resolve()
+                            if alt_path.exists():
+                                resolved = alt_path
+                    if fallback_root_path is not None:
+                        alt = _fallback_resolve_missing_path(raw_path=raw_path, search_root=fallback_root_path)
+                        if alt is not None and alt.exists():
+                            resolved = alt
+                    if not resolved.exists():
+                        raise ProcessingError(
+                            f"Row {row_idx}: file not found for column '{f.path_column}': {resolved}"
+                        )
                 raw_path_map[raw_path] = resolved
-            elif prev.resolve() != resolved.resolve():
-                raise ProcessingError(
-                    f"Row {row_idx}: same path value resolves to different files: {raw_path} -> {prev} vs {resolved}"
-                )
-            uploaded_files.append(resolved)
-
-            df_src = _read_measurement_file(resolved, f)
-            df_norm = _normalize_measurement_df(df_src, f)
+                uploaded_files.append(resolved)
+
+            row_files.append((f, resolved))
+        row_items.append((row_idx, row_dict, row_files))
+
+    # Pass 2: read + normalize each distinct (file, spec) once; rows often share measurement files
+    # (e.g. a common calibration curve). Parsing is I/O and C-kernel bound, so do it on a thread pool.
+    # Cached frames are never mutated below: canonical frames are built with merge()/assign(), which return new frames.
+    load_jobs: dict[tuple[str, str], tuple[FileSpec, Path]] = {}
+    for _, _, row_files in row_items:
+        for f, resolved in row_files:
+            load_jobs.setdefault((resolved.as_posix(), f.file_id), (f, resolved))
+    norm_cache: dict[tuple[str, str], pd.DataFrame | None] = dict(
+        zip(load_jobs.keys(), _map_parallel(_load_measurement, list(load_jobs.values())))
+    )
+
+    # Pass 3: aggregates and canonical frames per row.
+    agg_cache: dict[tuple[str, str], list[Any]] = {}
+    for row_pos, (row_idx, row_dict, row_files) in enumerate(row_items):
+        per_file_frames: list[tuple[FileSpec, pd.DataFrame]] = []
+        per_row_aggs: dict[str, Any] = {}
+
+        for f, resolved in row_files:
+            cache_key = (resolved.as_posix(), f.file_id)
+            df_norm = norm_cache[cache_key]
             if df_norm is None:
                 continue
 
-            # Aggregates
-            for agg in f.aggregates:
+            # Aggregates (a shared file yields the same values for every row that references it)
+            agg_results = agg_cache.get(cache_key)
+            if agg_results is None:
+                numeric: dict[str, Any] = {}
+                agg_results = agg_cache[cache_key] = [
+                    _compute_aggregate(df_norm, agg, numeric=numeric) for agg in f.aggregates
+                ]
+            for agg, value in zip(f.aggregates, agg_results):
                 out_col = agg.output_column or agg.name
                 key = out_col
                 if key in per_row_aggs:
                     raise ProcessingError(f"Row {row_idx}: duplicate aggregate output column: {key}")
-                per_row_aggs[key] = _compute_aggregate(df_norm, agg)
+                per_row_aggs[key] = value
 
             per_file_frames.append((f, df_norm))
 
-        # Write aggregates into conditions output
         for k, v in per_row_aggs.items():
-            if k not in conditions_out.columns:
-                conditions_out[k] = pd.NA
-            conditions_out.at[row_idx, k] = v
+            col_values = agg_values.get(k)
+            if col_values is None:
+                col_values = agg_values[k] = [unset] * len(cond_df)
+            col_values[row_pos] = v
 
         if not per_file_frames:
             continue
@@ -368,13 +571,14 @@ def process_condition_excel(
             # Decide whether to merge within the group
             do_merge = combine_mode in {"merge", "auto"} and len(items_in_group) > 1 and bool(join_keys)
             if not do_merge:
-                merged_or_appended.extend([df.copy() for _, df in items_in_group])
+                # No copy needed: the row columns are attached with assign() below, which returns a new frame.
+                merged_or_appended.extend([df for _, df in items_in_group])
                 continue
 
             merged = None
             for f, df in items_in_group:
                 keep_cols = join_keys + [c for c in df.columns if c not in {"x", "y", "z", "t"}]
-                df2 = df[keep_cols].copy()
+                df2 = df.loc[:, keep_cols]
                 if df2.duplicated(subset=join_keys).any():
                     raise ProcessingError(
                         f"Row {row_idx}: non-unique points for join keys {join_keys} in file '{f.file_id}'"
@@ -397,16 +601,35 @@ def process_condition_excel(
             if spec.output.include_file_path_columns or c.name not in file_path_cols
         ]
 
+        row_cols = {c: row_dict.get(c) for c in attach_cols}
+        row_cols.update(per_row_aggs)
+        row_cols["__condition_row"] = int(row_idx)
         for df in merged_or_appended:
-            for c in attach_cols:
-                df[c] = row_dict.get(c)
-            for k, v in per_row_aggs.items():
-                df[k] = v
-            df["__condition_row"] = int(row_idx)
-            canonical_frames.append(df)
+            canonical_frames.append(df.assign(**row_cols))
+
+    # Write aggregates into conditions output
+    new_agg_cols: dict[str, list[Any]] = {}
+    for k, col_values in agg_values.items():
+        if k in conditions_out.columns:
+            # Aggregate shares a name with an existing column: overwrite only the rows that computed it.
+            for pos, v in enumerate(col_values):
+                if v is not unset:
+                    conditions_out.at[conditions_out.index[pos], k] = v
+        else:
+            new_agg_cols[k] = [pd.NA if v is unset else v for v in col_values]
+    if new_agg_cols:
+        conditions_out = pd.concat(
+            [conditions_out, pd.DataFrame(new_agg_cols, index=conditions_out.index, dtype=object)],
+            axis=1,
+        )
+
+    norm_cache.clear()
+    agg_cache.clear()
 
     if canonical_frames:
         canonical_out = pd.concat(canonical_frames, ignore_index=True)
+        # Drop the per-row pieces now so they are freed before the CSV/Excel writers allocate their buffers.
+        canonical_frames.clear()
     else:
         canonical_out = pd.DataFrame(columns=["x", "y", "z", "t"] + [c.name for c in spec.condition_columns])
 
@@ -417,15 +640,14 @@ def process_condition_excel(
     conditions_out.to_csv(conditions_csv, index=False, encoding="utf-8")
     canonical_out.to_csv(canonical_csv, index=False, encoding="utf-8")
 
-    with pd.ExcelWriter(consolidated_excel, engine="openpyxl") as writer:
-        conditions_out.to_excel(writer, index=False, sheet_name="Conditions")
-        canonical_out.to_excel(writer, index=False, sheet_name="Canonical")
+    _write_consolidated_excel(consolidated_excel, [("Conditions", conditions_out), ("Canonical", canonical_out)])
 
     # De-duplicate upload list while preserving order
     seen: set[str] = set()
     unique_files: list[Path] = []
     for p in uploaded_files:
-        key = p.resolve().as_posix()
+        # All entries are already resolved, so the posix string identifies the file.
+        key = p.as_posix()
         if key in seen:
             continue
         seen.add(key)
@@ -438,4 +660,6 @@ def process_condition_excel(
         consolidated_excel=consolidated_excel,
         uploaded_files=unique_files,
         raw_path_map=raw_path_map,
+        conditions_df=conditions_out,
+        canonical_df=canonical_out,
     )
@@ -1,50 +1,98 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field, replace
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Mapping
 
+try:
+    import yaml
+except Exception:  # pragma: no cover
+    yaml = None  # type: ignore[assignment]
+
+# libyaml's C loader when PyYAML was built with it (same safe semantics, much faster parse).
+_SAFE_LOADER = getattr(yaml, "CSafeLoader", None) or getattr(yaml, "SafeLoader", None)
+
 
 class SpecError(ValueError):
     pass
 
 
-def _as_bool(v: Any, *, path: str) -> bool:
+_AXES = ("x", "y", "z", "t")
+_TARGET_OS = frozenset(("auto", "mac", "windows"))
+_WIN_MODE_MACRO = frozenset(("workbook", "macro"))
+_WIN_MODE_ADDIN = frozenset(("addin", "add-in", "xlam"))
+_COMBINE_MODES = frozenset(("auto", "merge", "append"))
+
+
+# Loops pass the _as_* helpers a per-item `path` prefix plus a `key`; the two are only joined when an error is
+# actually raised.
+
+
+def _err_path(path: str, key: str | None) -> str:
+    return path if key is None else f"{path}.{key}"
+
+
+def _as_bool(v: Any, *, path: str, key: str | None = None) -> bool:
     if isinstance(v, bool):
         return v
     if v in (0, 1):
         return bool(v)
-    raise SpecError(f"{path}: expected bool, got {type(v).__name__}")
+    raise SpecError(f"{_err_path(path, key)}: expected bool, got {type(v).__name__}")
 
 
-def _as_str(v: Any, *, path: str) -> str:
+def _as_str(v: Any, *, path: str, key: str | None = None) -> str:
     if isinstance(v, str) and v.strip():
         return v
-    raise SpecError(f"{path}: expected non-empty string, got {type(v).__name__}")
+    raise SpecError(f"{_err_path(path, key)}: expected non-empty string, got {type(v).__name__}")
 
 
-def _as_opt_str(v: Any, *, path: str) -> str | None:
+def _as_opt_str(v: Any, *, path: str, key: str | None = None) -> str | None:
     if v is None:
         return None
     if isinstance(v, str) and v.strip():
         return v
-    raise SpecError(f"{path}: expected string|null, got {type(v).__name__}")
+    raise SpecError(f"{_err_path(path, key)}: expected string|null, got {type(v).__name__}")
 
 
-def _as_list(v: Any, *, path: str) -> list[Any]:
+def _as_list(v: Any, *, path: str, key: str | None = None) -> list[Any]:
     if v is None:
         return []
     if isinstance(v, list):
         return v
-    raise SpecError(f"{path}: expected list, got {type(v).__name__}")
+    raise SpecError(f"{_err_path(path, key)}: expected list, got {type(v).__name__}")
 
 
-def _as_dict(v: Any, *, path: str) -> dict[str, Any]:
+def _as_str_list(v: Any, *, path: str, key: str | None = None) -> list[str]:
+    """_as_list + str() of each element in one pass (str elements are kept as-is)."""
+    if v is None:
+        return []
+    if isinstance(v, list):
+        return [str(x) for x in v]
+    raise SpecError(f"{_err_path(path, key)}: expected list, got {type(v).__name__}")
+
+
+def _opt_strs(d: Mapping[str, Any], keys: tuple[str, ...], *, path: str) -> tuple[str | None, ...]:
+    """_as_opt_str for several keys of one mapping (`path` is the mapping's path)."""
+    get = d.get
+    return tuple(_as_opt_str(get(k), path=path, key=k) for k in keys)
+
+
+def _as_dict(v: Any, *, path: str, key: str | None = None) -> dict[str, Any]:
     if v is None:
         return {}
     if isinstance(v, dict):
         return dict(v)
-    raise SpecError(f"{path}: expected mapping, got {type(v).__name__}")
+    raise SpecError(f"{_err_path(path, key)}: expected mapping, got {type(v).__name__}")
+
+
+def _as_norm_dict(v: Any, *, path: str, key: str | None = None) -> dict[str, Any]:
+    """_as_dict + _normalize_mapping in one pass (a single new dict with normalized keys)."""
+    if v is None:
+        return {}
+    if isinstance(v, dict):
+        return {_normalize_key(k): val for k, val in v.items()}
+    raise SpecError(f"{_err_path(path, key)}: expected mapping, got {type(v).__name__}")
 
 
 def _as_number(v: Any, *, path: str) -> float:
@@ -53,15 +101,19 @@ def _as_number(v: Any, *, path: str) -> float:
     raise SpecError(f"{path}: expected number, got {type(v).__name__}")
 
 
+@lru_cache(maxsize=4096, typed=True)  # typed: 1 and True must not share an entry
 def _normalize_key(key: Any) -> str:
     return str(key).strip().replace("-", "_")
 
 
 def _normalize_mapping(m: Mapping[str, Any]) -> dict[str, Any]:
+    # YAML-loaded mappings almost always have clean str keys already: return them as-is (callers only read).
+    if type(m) is dict and all(type(k) is str and "-" not in k and k == k.strip() for k in m):
+        return m
     return {_normalize_key(k): v for k, v in m.items()}
 
 
-def _parse_axis_source_and_type(v: Any, *, path: str) -> tuple[str | None, str | None]:
+def _parse_axis_source_and_type(v: Any, *, path: str, key: str | None = None) -> tuple[str | None, str | None]:
     """
     Accept either:
       - null
@@ -77,15 +129,16 @@ def _parse_axis_source_and_type(v: Any, *, path: str) -> tuple[str | None, str |
         return s, None
     if isinstance(v, Mapping):
         m = _normalize_mapping(v)
+        path = _err_path(path, key)
         src = m.get("source", m.get("column", m.get("name")))
-        source = _as_str(src, path=f"{path}.source")
+        source = _as_str(src, path=path, key="source")
         dtype_raw = m.get("type", m.get("dtype"))
-        dtype = _as_opt_str(dtype_raw, path=f"{path}.type")
+        dtype = _as_opt_str(dtype_raw, path=path, key="type")
         return source, dtype
-    raise SpecError(f"{path}: expected string|null|mapping, got {type(v).__name__}")
+    raise SpecError(f"{_err_path(path, key)}: expected string|null|mapping, got {type(v).__name__}")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ConditionColumn:
     name: str
     dtype: str = "str"
@@ -94,7 +147,7 @@ class ConditionColumn:
     enum: list[str] = field(default_factory=list)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AxisMapping:
     x: str | None = None
     y: str | None = None
@@ -102,14 +155,10 @@ class AxisMapping:
     t: str | None = None
 
     def defined_axes(self) -> set[str]:
-        axes: set[str] = set()
-        for k in ("x", "y", "z", "t"):
-            if getattr(self, k) is not None:
-                axes.add(k)
-        return axes
+        return {k for k, v in zip(_AXES, (self.x, self.y, self.z, self.t)) if v is not None}
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AxisTypeMapping:
     x: str | None = None
     y: str | None = None
@@ -117,21 +166,21 @@ class AxisTypeMapping:
     t: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TargetColumn:
     name: str
     source: str
     dtype: str = "float"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DerivedColumn:
     name: str
     expr: str
     dtype: str = "float"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Aggregate:
     name: str
     source: str
@@ -140,7 +189,7 @@ class Aggregate:
     output_column: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FileSpec:
     file_id: str
     path_column: str
@@ -154,10 +203,12 @@ class FileSpec:
     aggregates: list[Aggregate] = field(default_factory=list)
 
     def all_target_names(self) -> list[str]:
-        return [t.name for t in self.targets] + [d.name for d in self.derived]
+        names = [t.name for t in self.targets]
+        names.extend([d.name for d in self.derived])
+        return names
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ClearMLSpec:
     dataset_project: str
     dataset_name: str
@@ -167,7 +218,7 @@ class ClearMLSpec:
     execution: "ExecutionSpec | None" = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ExecutionSpec:
     repository: str
     branch: str | None = None
@@ -176,14 +227,17 @@ class ExecutionSpec:
     entry_point: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TemplateSpec:
     condition_sheet: str = "Conditions"
     meta_sheet: str = "_meta"
     template_filename: str = "condition_template.xlsm"
 
 
-@dataclass(frozen=True)
+_DEFAULT_TEMPLATE = TemplateSpec()
+
+
+@dataclass(frozen=True, slots=True)
 class AddinSpec:
     enabled: bool = False
     target_os: str = "auto"  # auto|mac|windows
@@ -199,7 +253,7 @@ class AddinSpec:
     windows_addin_filename: str = "clearml_dataset_excel_addin.xlam"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OutputSpec:
     output_dirname: str = "processed"
     canonical_filename: str = "canonical.csv"
@@ -209,7 +263,10 @@ class OutputSpec:
     combine_mode: str = "auto"  # auto|merge|append
 
 
-@dataclass(frozen=True)
+_DEFAULT_OUTPUT = OutputSpec()
+
+
+@dataclass(frozen=True, slots=True)
 class DatasetFormatSpec:
     schema_version: int
     clearml: ClearMLSpec | None
@@ -232,54 +289,62 @@ def parse_format_spec(raw: Mapping[str, Any], *, spec_path: Path | None = None)
     if schema_version != 1:
         raise SpecError("schema_version must be 1")
 
-    clearml_raw = _as_dict(raw.get("clearml"), path="clearml")
+    clearml_raw = _as_norm_dict(raw.get("clearml"), path="clearml")
     clearml: ClearMLSpec | None
     if clearml_raw:
-        clearml_raw = _normalize_mapping(clearml_raw)
         output_uri = _as_opt_str(clearml_raw.get("output_uri"), path="clearml.output_uri")
         if spec_path is not None and isinstance(output_uri, str) and output_uri.startswith("file://"):
             uri_path = output_uri[len("file://") :]
             if uri_path and not uri_path.startswith("/"):
                 abs_path = (spec_path.parent / Path(uri_path)).expanduser().resolve()
                 output_uri = "file://" + abs_path.as_posix()
-        exec_raw = _normalize_mapping(_as_dict(clearml_raw.get("execution"), path="clearml.execution"))
+        exec_raw = _as_norm_dict(clearml_raw.get("execution"), path="clearml.execution")
         execution = None
         if exec_raw:
             repository = _as_str(exec_raw.get("repository"), path="clearml.execution.repository")
+            branch, commit, working_dir, entry_point = _opt_strs(
+                exec_raw, ("branch", "commit", "working_dir", "entry_point"), path="clearml.execution"
+            )
             execution = ExecutionSpec(
                 repository=repository,
-                branch=_as_opt_str(exec_raw.get("branch"), path="clearml.execution.branch"),
-                commit=_as_opt_str(exec_raw.get("commit"), path="clearml.execution.commit"),
-                working_dir=_as_opt_str(exec_raw.get("working_dir"), path="clearml.execution.working_dir"),
-                entry_point=_as_opt_str(exec_raw.get("entry_point"), path="clearml.execution.entry_point"),
+                branch=branch,
+                commit=commit,
+                working_dir=working_dir,
+                entry_point=entry_point,
             )
 
         clearml = ClearMLSpec(
             dataset_project=_as_str(clearml_raw.get("dataset_project"), path="clearml.dataset_project"),
             dataset_name=_as_str(clearml_raw.get("dataset_name"), path="clearml.dataset_name"),
             output_uri=output_uri,
-            tags=[str(x) for x in _as_list(clearml_raw.get("tags"), path="clearml.tags")],
+            tags=_as_str_list(clearml_raw.get("tags"), path="clearml.tags"),
             use_current_task=_as_bool(clearml_raw.get("use_current_task", False), path="clearml.use_current_task"),
             execution=execution,
         )
     else:
         clearml = None
 
-    template_raw = _normalize_mapping(_as_dict(raw.get("template"), path="template"))
-    template = TemplateSpec(
-        condition_sheet=str(template_raw.get("condition_sheet", "Conditions")),
-        meta_sheet=str(template_raw.get("meta_sheet", "_meta")),
-        template_filename=str(template_raw.get("template_filename", "condition_template.xlsm")),
-    )
+    # Omitted template/output sections share one frozen default instance.
+    template_raw = _as_norm_dict(raw.get("template"), path="template")
+    if not template_raw:
+        template = _DEFAULT_TEMPLATE
+    else:
+        template = TemplateSpec(
+            condition_sheet=str(template_raw.get("condition_sheet", "Conditions")),
+            meta_sheet=str(template_raw.get("meta_sheet", "_meta")),
+            template_filename=str(template_raw.get("template_filename", "condition_template.xlsm")),
+        )
 
-    addin_raw = _normalize_mapping(_as_dict(raw.get("addin"), path="addin"))
-    target_os = str(addin_raw.get("target_os", addin_raw.get("os", "auto"))).strip().lower() if addin_raw else "auto"
-    if target_os in {"win"}:
+    addin_raw = _as_norm_dict(raw.get("addin"), path="addin")
+    # Every addin field has a default, so an empty/missing section needs no special-casing.
+    addin_get = addin_raw.get
+    target_os = str(addin_get("target_os", addin_get("os", "auto"))).strip().lower()
+    if target_os == "win":
         target_os = "windows"
-    if target_os not in {"auto", "mac", "windows"}:
+    if target_os not in _TARGET_OS:
         raise SpecError("addin.target_os must be one of: auto, mac, windows")
 
-    spec_filename = addin_raw.get("spec_filename") if addin_raw else None
+    spec_filename = addin_get("spec_filename")
     if spec_filename is not None:
         spec_filename = _as_opt_str(spec_filename, path="addin.spec_filename")
     if not spec_filename:
@@ -287,62 +352,35 @@ def parse_format_spec(raw: Mapping[str, Any], *, spec_path: Path | None = None)
     if Path(str(spec_filename)).name != str(spec_filename):
         raise SpecError("addin.spec_filename must be a file name (no directory components)")
 
-    addin_enabled = _as_bool(addin_raw.get("enabled", False), path="addin.enabled") if addin_raw else False
-    addin_command = _as_opt_str(addin_raw.get("command"), path="addin.command") if addin_raw else None
-    addin_command_mac = _as_opt_str(addin_raw.get("command_mac"), path="addin.command_mac") if addin_raw else None
-    addin_command_windows = _as_opt_str(addin_raw.get("command_windows"), path="addin.command_windows") if addin_raw else None
+    addin_enabled = _as_bool(addin_get("enabled", False), path="addin.enabled")
+    addin_command, addin_command_mac, addin_command_windows = _opt_strs(
+        addin_raw, ("command", "command_mac", "command_windows"), path="addin"
+    )
 
     # More robust defaults for end-user Excel execution: only when user did not specify any command.
     if addin_enabled and not addin_command and not addin_command_mac:
         addin_command_mac = '/usr/bin/env python3 -m clearml_dataset_excel.cli run --spec "${SPEC}" --excel "${EXCEL}"'
 
-    addin = AddinSpec(
-        enabled=addin_enabled,
-        target_os=target_os,
-        spec_filename=spec_filename,
-        vba_module_filename=str(addin_raw.get("vba_module_filename", "clearml_dataset_excel_addin.bas"))
-        if addin_raw
-        else "clearml_dataset_excel_addin.bas",
-        vba_template_excel=_as_opt_str(addin_raw.get("vba_template_excel"), path="addin.vba_template_excel")
-        if addin_raw
-        else None,
-        embed_vba=_as_bool(addin_raw.get("embed_vba", False), path="addin.embed_vba") if addin_raw else False,
-        command=addin_command,
-        command_mac=addin_command_mac,
-        command_windows=addin_command_windows,
-        windows_mode="macro",
-        windows_template_filename=None,
-        windows_addin_filename="clearml_dataset_excel_addin.xlam",
-    )
+    vba_module_filename = str(addin_get("vba_module_filename", "clearml_dataset_excel_addin.bas"))
+    vba_template_excel = _as_opt_str(addin_get("vba_template_excel"), path="addin.vba_template_excel")
+    embed_vba = _as_bool(addin_get("embed_vba", False), path="addin.embed_vba")
 
     # Windows distribution mode: workbook macro (legacy) vs .xlam add-in (recommended on Windows).
-    win_mode = str(
-        addin_raw.get("windows_mode", addin_raw.get("mode_windows", addin_raw.get("win_mode", "macro")))
-        if addin_raw
-        else "macro"
-    ).strip().lower()
-    if win_mode in {"workbook", "macro"}:
+    win_mode = str(addin_get("windows_mode", addin_get("mode_windows", addin_get("win_mode", "macro")))).strip().lower()
+    if win_mode in _WIN_MODE_MACRO:
         win_mode = "macro"
-    elif win_mode in {"addin", "add-in", "xlam"}:
+    elif win_mode in _WIN_MODE_ADDIN:
         win_mode = "addin"
     else:
         raise SpecError("addin.windows_mode must be one of: macro, addin")
 
-    win_template = (
-        _as_opt_str(
-            addin_raw.get("windows_template_filename", addin_raw.get("template_filename_windows")),
-            path="addin.windows_template_filename",
-        )
-        if addin_raw
-        else None
+    win_template = _as_opt_str(
+        addin_get("windows_template_filename", addin_get("template_filename_windows")),
+        path="addin.windows_template_filename",
     )
-    win_addin = (
-        _as_opt_str(
-            addin_raw.get("windows_addin_filename", addin_raw.get("addin_filename_windows")),
-            path="addin.windows_addin_filename",
-        )
-        if addin_raw
-        else None
+    win_addin = _as_opt_str(
+        addin_get("windows_addin_filename", addin_get("addin_filename_windows")),
+        path="addin.windows_addin_filename",
     )
     if not win_addin:
         win_addin = "clearml_dataset_excel_addin.xlam"
@@ -360,66 +398,85 @@ def parse_format_spec(raw: Mapping[str, Any], *, spec_path: Path | None = None)
         if not str(win_addin).lower().endswith(".xlam"):
             raise SpecError("addin.windows_addin_filename must end with .xlam when addin.windows_mode=addin")
 
-    addin = replace(
-        addin,
+        if addin_enabled and not addin_command and not addin_command_windows:
+            addin_command_windows = (
+                'if exist "clearml_dataset_excel_runner.exe" '
+                '("clearml_dataset_excel_runner.exe" run --spec "${SPEC}" --excel "${EXCEL}") '
+                'else (clearml-dataset-excel run --spec "${SPEC}" --excel "${EXCEL}")'
+            )
+
+    addin = AddinSpec(
+        enabled=addin_enabled,
+        target_os=target_os,
+        spec_filename=spec_filename,
+        vba_module_filename=vba_module_filename,
+        vba_template_excel=vba_template_excel,
+        embed_vba=embed_vba,
+        command=addin_command,
+        command_mac=addin_command_mac,
+        command_windows=addin_command_windows,
         windows_mode=win_mode,
         windows_template_filename=win_template,
         windows_addin_filename=win_addin,
     )
 
-    if addin.enabled and addin.windows_mode == "addin" and not addin.command and not addin.command_windows:
-        addin = replace(
-            addin,
-            command_windows=(
-                'if exist "clearml_dataset_excel_runner.exe" '
-                '("clearml_dataset_excel_runner.exe" run --spec "${SPEC}" --excel "${EXCEL}") '
-                'else (clearml-dataset-excel run --spec "${SPEC}" --excel "${EXCEL}")'
-            ),
-        )
-
     # The bundled default vbaProject.bin (for embed_vba and .xlam generation) assumes meta sheet name "_meta".
     if addin.windows_mode == "addin" and template.meta_sheet != "_meta":
         raise SpecError("addin.windows_mode=addin requires template.meta_sheet to be '_meta' (bundled .xlam macro expects _meta).")
     if addin.embed_vba and not addin.vba_template_excel and template.meta_sheet != "_meta":
         raise SpecError("addin.embed_vba=true requires template.meta_sheet to be '_meta' when using bundled vbaProject.bin.")
 
-    output_raw = _normalize_mapping(_as_dict(raw.get("output"), path="output"))
-    combine_mode = str(output_raw.get("combine_mode", "auto")).strip().lower()
-    if combine_mode not in {"auto", "merge", "append"}:
-        raise SpecError("output.combine_mode must be one of: auto, merge, append")
-    output = OutputSpec(
-        output_dirname=str(output_raw.get("output_dirname", "processed")),
-        canonical_filename=str(output_raw.get("canonical_filename", "canonical.csv")),
-        conditions_filename=str(output_raw.get("conditions_filename", "conditions.csv")),
-        consolidated_excel_filename=str(output_raw.get("consolidated_excel_filename", "consolidated.xlsx")),
-        include_file_path_columns=_as_bool(
-            output_raw.get("include_file_path_columns", True), path="output.include_file_path_columns"
-        ),
-        combine_mode=combine_mode,
-    )
+    output_raw = _as_norm_dict(raw.get("output"), path="output")
+    if not output_raw:
+        output = _DEFAULT_OUTPUT
+    else:
+        combine_mode = str(output_raw.get("combine_mode", "auto")).strip().lower()
+        if combine_mode not in _COMBINE_MODES:
+            raise SpecError("output.combine_mode must be one of: auto, merge, append")
+        output = OutputSpec(
+            output_dirname=str(output_raw.get("output_dirname", "processed")),
+            canonical_filename=str(output_raw.get("canonical_filename", "canonical.csv")),
+            conditions_filename=str(output_raw.get("conditions_filename", "conditions.csv")),
+            consolidated_excel_filename=str(output_raw.get("consolidated_excel_filename", "consolidated.xlsx")),
+            include_file_path_columns=_as_bool(
+                output_raw.get("include_file_path_columns", True), path="output.include_file_path_columns"
+            ),
+            combine_mode=combine_mode,
+        )
 
     cond_from_root = raw.get("condition")
-    if cond_from_root is None and "condition_columns" in raw:
-        cond_from_root = {"columns": raw.get("condition_columns")}
-    cond_raw = _normalize_mapping(_as_dict(cond_from_root, path="condition"))
-    columns_raw = _as_list(cond_raw.get("columns"), path="condition.columns")
+    if cond_from_root is None:
+        columns_raw = raw.get("condition_columns")
+    elif type(cond_from_root) is dict:
+        columns_raw = cond_from_root.get("columns")
+    else:
+        columns_raw = None
+    # Common shape (`condition: {columns: [...]}` or root `condition_columns: [...]`) skips the generic helpers.
+    if type(columns_raw) is not list:
+        if cond_from_root is None and "condition_columns" in raw:
+            cond_from_root = {"columns": raw.get("condition_columns")}
+        cond_raw = _as_norm_dict(cond_from_root, path="condition")
+        columns_raw = _as_list(cond_raw.get("columns"), path="condition.columns")
     if not columns_raw:
         raise SpecError("condition.columns is required and must be non-empty")
 
     condition_columns: list[ConditionColumn] = []
+    # Duplicate checks below use add() + a size check: one hash operation per name instead of `in` + add().
     seen_col_names: set[str] = set()
     for i, c in enumerate(columns_raw):
+        cp = f"condition.columns[{i}]"
         if not isinstance(c, dict):
-            raise SpecError(f"condition.columns[{i}]: expected mapping")
+            raise SpecError(f"{cp}: expected mapping")
         c = _normalize_mapping(c)
-        name = _as_str(c.get("name"), path=f"condition.columns[{i}].name")
-        if name in seen_col_names:
-            raise SpecError(f"condition.columns[{i}].name: duplicate column name: {name}")
+        name = _as_str(c.get("name"), path=cp, key="name")
+        n_seen = len(seen_col_names)
         seen_col_names.add(name)
+        if len(seen_col_names) == n_seen:
+            raise SpecError(f"{cp}.name: duplicate column name: {name}")
         dtype = str(c.get("type", c.get("dtype", "str")))
-        required = _as_bool(c.get("required", False), path=f"condition.columns[{i}].required")
-        description = _as_opt_str(c.get("description"), path=f"condition.columns[{i}].description")
-        enum = [str(x) for x in _as_list(c.get("enum"), path=f"condition.columns[{i}].enum")]
+        required = _as_bool(c.get("required", False), path=cp, key="required")
+        description = _as_opt_str(c.get("description"), path=cp, key="description")
+        enum = _as_str_list(c.get("enum"), path=cp, key="enum")
         condition_columns.append(
             ConditionColumn(name=name, dtype=dtype, required=required, description=description, enum=enum)
         )
@@ -432,22 +489,25 @@ def parse_format_spec(raw: Mapping[str, Any], *, spec_path: Path | None = None)
     seen_file_ids: set[str] = set()
     file_path_columns: set[str] = set()
     for i, f in enumerate(files_raw):
+        fp = f"files[{i}]"
         if not isinstance(f, dict):
-            raise SpecError(f"files[{i}]: expected mapping")
+            raise SpecError(f"{fp}: expected mapping")
         f = _normalize_mapping(f)
-        file_id = _as_str(f.get("id", f.get("file_id")), path=f"files[{i}].id")
-        if file_id in seen_file_ids:
-            raise SpecError(f"files[{i}].id: duplicate id: {file_id}")
+        file_id = _as_str(f.get("id", f.get("file_id")), path=fp, key="id")
+        n_seen = len(seen_file_ids)
         seen_file_ids.add(file_id)
+        if len(seen_file_ids) == n_seen:
+            raise SpecError(f"{fp}.id: duplicate id: {file_id}")
 
-        path_column = _as_str(f.get("path_column"), path=f"files[{i}].path_column")
-        if path_column in file_path_columns:
-            raise SpecError(f"files[{i}].path_column: duplicate path_column: {path_column}")
+        path_column = _as_str(f.get("path_column"), path=fp, key="path_column")
+        n_seen = len(file_path_columns)
         file_path_columns.add(path_column)
+        if len(file_path_columns) == n_seen:
+            raise SpecError(f"{fp}.path_column: duplicate path_column: {path_column}")
 
         fmt = str(f.get("format", "csv")).lower()
-        sheet = _as_opt_str(f.get("sheet"), path=f"files[{i}].sheet")
-        read_opts = _as_dict(f.get("read"), path=f"files[{i}].read")
+        sheet = _as_opt_str(f.get("sheet"), path=fp, key="sheet")
+        read_opts = _as_dict(f.get("read"), path=fp, key="read")
 
         mapping_src = f.get("mapping")
         if mapping_src is None and any(k in f for k in ("axes", "targets", "derived", "aggregates")):
@@ -457,61 +517,66 @@ def parse_format_spec(raw: Mapping[str, Any], *, spec_path: Path | None = None)
                 "derived": f.get("derived"),
                 "aggregates": f.get("aggregates"),
             }
-        mapping = _normalize_mapping(_as_dict(mapping_src, path=f"files[{i}].mapping"))
-        axes_raw = _normalize_mapping(_as_dict(mapping.get("axes"), path=f"files[{i}].mapping.axes"))
+        mapping = _as_norm_dict(mapping_src, path=fp, key="mapping")
+        mp = f"{fp}.mapping"
+        axes_raw = _as_norm_dict(mapping.get("axes"), path=mp, key="axes")
+        ap = f"{mp}.axes"
         axes_kwargs: dict[str, str | None] = {}
         axis_type_kwargs: dict[str, str | None] = {}
-        for axis in ("x", "y", "z", "t"):
-            src, dtype = _parse_axis_source_and_type(axes_raw.get(axis), path=f"files[{i}].mapping.axes.{axis}")
+        for axis in _AXES:
+            src, dtype = _parse_axis_source_and_type(axes_raw.get(axis), path=ap, key=axis)
             axes_kwargs[axis] = src
             axis_type_kwargs[axis] = dtype
         axes = AxisMapping(**axes_kwargs)
         axis_types = AxisTypeMapping(**axis_type_kwargs)
 
-        targets_raw = _as_list(mapping.get("targets"), path=f"files[{i}].mapping.targets")
+        targets_raw = _as_list(mapping.get("targets"), path=mp, key="targets")
         targets: list[TargetColumn] = []
         seen_targets: set[str] = set()
         for j, t in enumerate(targets_raw):
+            ip = f"{mp}.targets[{j}]"
             if not isinstance(t, dict):
-                raise SpecError(f"files[{i}].mapping.targets[{j}]: expected mapping")
+                raise SpecError(f"{ip}: expected mapping")
             t = _normalize_mapping(t)
-            t_name = _as_str(t.get("name"), path=f"files[{i}].mapping.targets[{j}].name")
-            if t_name in seen_targets:
-                raise SpecError(f"files[{i}].mapping.targets[{j}].name: duplicate target name: {t_name}")
+            t_name = _as_str(t.get("name"), path=ip, key="name")
+            n_seen = len(seen_targets)
             seen_targets.add(t_name)
-            t_source = _as_str(t.get("source"), path=f"files[{i}].mapping.targets[{j}].source")
+            if len(seen_targets) == n_seen:
+                raise SpecError(f"{ip}.name: duplicate target name: {t_name}")
+            t_source = _as_str(t.get("source"), path=ip, key="source")
             t_dtype = str(t.get("type", t.get("dtype", "float")))
             targets.append(TargetColumn(name=t_name, source=t_source, dtype=t_dtype))
 
-        derived_raw = _as_list(mapping.get("derived"), path=f"files[{i}].mapping.derived")
+        derived_raw = _as_list(mapping.get("derived"), path=mp, key="derived")
         derived: list[DerivedColumn] = []
         for j, d in enumerate(derived_raw):
+            ip = f"{mp}.derived[{j}]"
             if not isinstance(d, dict):
-                raise SpecError(f"files[{i}].mapping.derived[{j}]: expected mapping")
+                raise SpecError(f"{ip}: expected mapping")
             d = _normalize_mapping(d)
-            d_name = _as_str(d.get("name"), path=f"files[{i}].mapping.derived[{j}].name")
-            if d_name in seen_targets:
-                raise SpecError(f"files[{i}].mapping.derived[{j}].name: duplicate name: {d_name}")
+            d_name = _as_str(d.get("name"), path=ip, key="name")
+            n_seen = len(seen_targets)
             seen_targets.add(d_name)
-            expr = _as_str(d.get("expr"), path=f"files[{i}].mapping.derived[{j}].expr")
+            if len(seen_targets) == n_seen:
+                raise SpecError(f"{ip}.name: duplicate name: {d_name}")
+            expr = _as_str(d.get("expr"), path=ip, key="expr")
             d_dtype = str(d.get("type", d.get("dtype", "float")))
             derived.append(DerivedColumn(name=d_name, expr=expr, dtype=d_dtype))
 
-        aggregates_raw = _as_list(mapping.get("aggregates"), path=f"files[{i}].mapping.aggregates")
+        aggregates_raw = _as_list(mapping.get("aggregates"), path=mp, key="aggregates")
         aggregates: list[Aggregate] = []
         for j, a in enumerate(aggregates_raw):
+            ip = f"{mp}.aggregates[{j}]"
             if not isinstance(a, dict):
-                raise SpecError(f"files[{i}].mapping.aggregates[{j}]: expected mapping")
+                raise SpecError(f"{ip}: expected mapping")
             a = _normalize_mapping(a)
-            a_name = _as_str(a.get("name"), path=f"files[{i}].mapping.aggregates[{j}].name")
-            a_source = _as_str(a.get("source"), path=f"files[{i}].mapping.aggregates[{j}].source")
+            a_name = _as_str(a.get("name"), path=ip, key="name")
+            a_source = _as_str(a.get("source"), path=ip, key="source")
             op = str(a.get("op")).strip()
             if not op:
-                raise SpecError(f"files[{i}].mapping.aggregates[{j}].op: required")
-            wrt = _as_opt_str(a.get("wrt"), path=f"files[{i}].mapping.aggregates[{j}].wrt")
-            output_column = _as_opt_str(
-                a.get("output_column"), path=f"files[{i}].mapping.aggregates[{j}].output_column"
-            )
+                raise SpecError(f"{ip}.op: required")
+            wrt = _as_opt_str(a.get("wrt"), path=ip, key="wrt")
+            output_column = _as_opt_str(a.get("output_column"), path=ip, key="output_column")
             aggregates.append(Aggregate(name=a_name, source=a_source, op=op, wrt=wrt, output_column=output_column))
 
         files.append(
@@ -530,19 +595,17 @@ def parse_format_spec(raw: Mapping[str, Any], *, spec_path: Path | None = None)
         )
 
     # Validate that every file path column is defined in condition columns
-    cond_col_names = {c.name for c in condition_columns}
-    missing = sorted(file_path_columns - cond_col_names)
+    missing = sorted(file_path_columns - seen_col_names)
     if missing:
         raise SpecError(f"files[*].path_column not found in condition.columns: {missing}")
 
     # Validate global uniqueness of canonical target/derived names across files
-    seen_global_targets: dict[str, str] = {}
+    target_owners: dict[str, str] = {}
     for f in files:
         for name in f.all_target_names():
-            prev = seen_global_targets.get(name)
-            if prev and prev != f.file_id:
+            prev = target_owners.setdefault(name, f.file_id)
+            if prev != f.file_id:
                 raise SpecError(f"Duplicate target/derived name across files: {name} (files: {prev}, {f.file_id})")
-            seen_global_targets[name] = f.file_id
 
     return DatasetFormatSpec(
         schema_version=1,
@@ -558,89 +621,105 @@ def parse_format_spec(raw: Mapping[str, Any], *, spec_path: Path | None = None)
 def load_format_spec(path: str | Path) -> DatasetFormatSpec:
     spec_path = Path(path).expanduser().resolve()
     raw_text = spec_path.read_text(encoding="utf-8")
+    return _load_format_spec_cached(str(spec_path), raw_text)
 
-    try:
-        import yaml
-    except Exception as e:  # pragma: no cover
-        raise RuntimeError("YAML spec requires 'PyYAML'. Install dependencies first.") from e
 
-    raw = yaml.safe_load(raw_text)
+# Keyed by (resolved path, file text): unchanged specs skip YAML parsing and validation. The returned spec is
+# frozen and shared between callers; invalid specs raise and are not cached.
+@lru_cache(maxsize=32)
+def _load_format_spec_cached(spec_path_str: str, raw_text: str) -> DatasetFormatSpec:
+    if yaml is None:  # pragma: no cover
+        raise RuntimeError("YAML spec requires 'PyYAML'. Install dependencies first.")
+
+    raw = yaml.load(raw_text, Loader=_SAFE_LOADER)
     if not isinstance(raw, dict):
         raise SpecError("Spec root must be a mapping (YAML dict)")
-    return parse_format_spec(raw, spec_path=spec_path)
+    return parse_format_spec(raw, spec_path=Path(spec_path_str))
 
 
 def load_format_spec_from_mapping(raw: Mapping[str, Any]) -> DatasetFormatSpec:
     return parse_format_spec(raw, spec_path=None)
 
 
-def spec_to_yaml_dict(spec: DatasetFormatSpec) -> dict[str, Any]:
-    out: dict[str, Any] = {"schema_version": int(spec.schema_version)}
-
-    if spec.clearml is not None:
-        out["clearml"] = {
-            "dataset_project": spec.clearml.dataset_project,
-            "dataset_name": spec.clearml.dataset_name,
-            "output_uri": spec.clearml.output_uri,
-            "tags": list(spec.clearml.tags),
-            "use_current_task": bool(spec.clearml.use_current_task),
-        }
-        if spec.clearml.execution is not None:
-            out["clearml"]["execution"] = {
-                "repository": spec.clearml.execution.repository,
-                "branch": spec.clearml.execution.branch,
-                "commit": spec.clearml.execution.commit,
-                "working_dir": spec.clearml.execution.working_dir,
-                "entry_point": spec.clearml.execution.entry_point,
-            }
-
-    out["template"] = {
-        "condition_sheet": spec.template.condition_sheet,
-        "meta_sheet": spec.template.meta_sheet,
-        "template_filename": spec.template.template_filename,
+def _axes_to_yaml(axes: AxisMapping, axis_types: AxisTypeMapping) -> dict[str, Any]:
+    return {
+        k: ({"source": v, "type": dt} if isinstance(dt, str) and dt.strip() else v)
+        for k, v, dt in zip(
+            _AXES,
+            (axes.x, axes.y, axes.z, axes.t),
+            (axis_types.x, axis_types.y, axis_types.z, axis_types.t),
+        )
+        if v is not None
     }
 
-    out["addin"] = {
-        "enabled": bool(spec.addin.enabled),
-        "target_os": spec.addin.target_os,
-        "spec_filename": spec.addin.spec_filename,
-        "vba_module_filename": spec.addin.vba_module_filename,
-        "vba_template_excel": spec.addin.vba_template_excel,
-        "embed_vba": bool(spec.addin.embed_vba),
-        "command": spec.addin.command,
-        "command_mac": spec.addin.command_mac,
-        "command_windows": spec.addin.command_windows,
-        "windows_mode": spec.addin.windows_mode,
-        "windows_template_filename": spec.addin.windows_template_filename,
-        "windows_addin_filename": spec.addin.windows_addin_filename,
-    }
 
-    out["condition"] = {
-        "columns": [
-            {
-                "name": c.name,
-                "type": c.dtype,
-                "required": bool(c.required),
-                "description": c.description,
-                "enum": list(c.enum),
+def spec_to_yaml_dict(spec: DatasetFormatSpec) -> dict[str, Any]:
+    # Every sub-dict is built as one literal (conditional keys via ** unpacking), keeping the key order stable.
+    clearml = spec.clearml
+    execution = clearml.execution if clearml is not None else None
+    template = spec.template
+    addin = spec.addin
+    output = spec.output
+    return {
+        "schema_version": int(spec.schema_version),
+        **(
+            {}
+            if clearml is None
+            else {
+                "clearml": {
+                    "dataset_project": clearml.dataset_project,
+                    "dataset_name": clearml.dataset_name,
+                    "output_uri": clearml.output_uri,
+                    "tags": list(clearml.tags),
+                    "use_current_task": bool(clearml.use_current_task),
+                    **(
+                        {}
+                        if execution is None
+                        else {
+                            "execution": {
+                                "repository": execution.repository,
+                                "branch": execution.branch,
+                                "commit": execution.commit,
+                                "working_dir": execution.working_dir,
+                                "entry_point": execution.entry_point,
+                            }
+                        }
+                    ),
+                }
             }
-            for c in spec.condition_columns
-        ]
-    }
-
-    files_out: list[dict[str, Any]] = []
-    for f in spec.files:
-        axes: dict[str, Any] = {}
-        for k in ("x", "y", "z", "t"):
-            v = getattr(f.axes, k)
-            if v is not None:
-                dt = getattr(f.axis_types, k, None)
-                if isinstance(dt, str) and dt.strip():
-                    axes[k] = {"source": v, "type": dt}
-                else:
-                    axes[k] = v
-
-        files_out.append(
+        ),
+        "template": {
+            "condition_sheet": template.condition_sheet,
+            "meta_sheet": template.meta_sheet,
+            "template_filename": template.template_filename,
+        },
+        "addin": {
+            "enabled": bool(addin.enabled),
+            "target_os": addin.target_os,
+            "spec_filename": addin.spec_filename,
+            "vba_module_filename": addin.vba_module_filename,
+            "vba_template_excel": addin.vba_template_excel,
+            "embed_vba": bool(addin.embed_vba),
+            "command": addin.command,
+            "command_mac": addin.command_mac,
+            "command_windows": addin.command_windows,
+            "windows_mode": addin.windows_mode,
+            "windows_template_filename": addin.windows_template_filename,
+            "windows_addin_filename": addin.windows_addin_filename,
+        },
+        "condition": {
+            "columns": [
+                {
+                    "name": c.name,
+                    "type": c.dtype,
+                    "required": bool(c.required),
+                    "description": c.description,
+                    "enum": list(c.enum),
+                }
+                for c in spec.condition_columns
+            ]
+        },
+        "files": [
             {
                 "id": f.file_id,
                 "path_column": f.path_column,
@@ -648,7 +727,7 @@ def spec_to_yaml_dict(spec: DatasetFormatSpec) -> dict[str, Any]:
                 "sheet": f.sheet,
                 "read": dict(f.read),
                 "mapping": {
-                    "axes": axes,
+                    "axes": _axes_to_yaml(f.axes, f.axis_types),
                     "targets": [{"name": t.name, "source": t.source, "type": t.dtype} for t in f.targets],
                     "derived": [{"name": d.name, "expr": d.expr, "type": d.dtype} for d in f.derived],
                     "aggregates": [
@@ -663,21 +742,18 @@ def spec_to_yaml_dict(spec: DatasetFormatSpec) -> dict[str, Any]:
                     ],
                 },
             }
-        )
-
-    out["files"] = files_out
-
-    out["output"] = {
-        "output_dirname": spec.output.output_dirname,
-        "canonical_filename": spec.output.canonical_filename,
-        "conditions_filename": spec.output.conditions_filename,
-        "consolidated_excel_filename": spec.output.consolidated_excel_filename,
-        "include_file_path_columns": bool(spec.output.include_file_path_columns),
-        "combine_mode": spec.output.combine_mode,
+            for f in spec.files
+        ],
+        "output": {
+            "output_dirname": output.output_dirname,
+            "canonical_filename": output.canonical_filename,
+            "conditions_filename": output.conditions_filename,
+            "consolidated_excel_filename": output.consolidated_excel_filename,
+            "include_file_path_columns": bool(output.include_file_path_columns),
+            "combine_mode": output.combine_mode,
+        },
     }
 
-    return out
-
 
 def with_clearml_values(
     spec: DatasetFormatSpec,
@@ -691,31 +767,30 @@ def with_clearml_values(
     Return a copy of the spec where `clearml.dataset_project/dataset_name` (and optionally `output_uri/tags`)
     are updated to the provided values.
     """
-    if spec.clearml is None:
-        clearml = ClearMLSpec(
-            dataset_project=str(dataset_project),
-            dataset_name=str(dataset_name),
-            output_uri=output_uri,
-            tags=list(tags or []),
-            use_current_task=False,
-            execution=None,
-        )
-    else:
-        clearml = replace(
-            spec.clearml,
-            dataset_project=str(dataset_project),
-            dataset_name=str(dataset_name),
-            output_uri=output_uri,
-            tags=list(tags) if tags is not None else list(spec.clearml.tags),
-        )
-    return replace(spec, clearml=clearml)
+    # Both specs are built directly with their full field set (no generic dataclasses.replace copy).
+    prev = spec.clearml
+    clearml = ClearMLSpec(
+        dataset_project=str(dataset_project),
+        dataset_name=str(dataset_name),
+        output_uri=output_uri,
+        tags=list(tags) if tags is not None else (list(prev.tags) if prev is not None else []),
+        use_current_task=prev.use_current_task if prev is not None else False,
+        execution=prev.execution if prev is not None else None,
+    )
+    return DatasetFormatSpec(
+        schema_version=spec.schema_version,
+        clearml=clearml,
+        template=spec.template,
+        addin=spec.addin,
+        condition_columns=spec.condition_columns,
+        files=spec.files,
+        output=spec.output,
+    )
 
 
 def dump_spec_yaml(spec: DatasetFormatSpec) -> str:
-    try:
-        import yaml
-    except Exception as e:  # pragma: no cover
-        raise RuntimeError("Writing spec requires 'PyYAML'. Install dependencies first.") from e
+    if yaml is None:  # pragma: no cover
+        raise RuntimeError("Writing spec requires 'PyYAML'. Install dependencies first.")
 
     return yaml.safe_dump(spec_to_yaml_dict(spec), allow_unicode=True, sort_keys=False) + "\n"
 
@@ -17,29 +17,105 @@ def write_manifest_csv(path: Path, rows: Sequence[Mapping[str, Any]]) -> None:
 
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=keys, extrasaction="ignore")
-        writer.writeheader()
+        if all(type(k) is str for k in seen):
+            # Common case: rows are written as plain lists in header order (csv writes None and missing as "").
+            writer = csv.writer(f)
+            writer.writerow(keys)
+            writer.writerows([r.get(k) for k in keys] for r in rows)
+            return
+        dict_writer = csv.DictWriter(f, fieldnames=keys, extrasaction="ignore")
+        dict_writer.writeheader()
         for r in rows:
-            writer.writerow({str(k): ("" if v is None else v) for k, v in r.items()})
+            dict_writer.writerow({str(k): ("" if v is None else v) for k, v in r.items()})
+
+
+# pandas.read_csv's default missing-value strings, so CSV manifests read without pandas keep the same gaps.
+_CSV_NA_VALUES = frozenset(
+    (
+        "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+        "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+    )
+)
+
+
+_CSV_BOOL_VALUES = frozenset(("true", "false"))
+
+
+def _csv_value_may_convert(v: str) -> bool:
+    """True if pandas could infer a non-string dtype for a column holding `v` (numbers, booleans)."""
+    if v.lower() in _CSV_BOOL_VALUES:
+        return True
+    try:
+        float(v)
+    except ValueError:
+        return False
+    return True
+
+
+def _read_rows_from_csv(manifest_path: Path, sep: str) -> tuple[list[dict[str, Any]], list[str]] | None:
+    """
+    Read a CSV/TSV manifest with the stdlib csv module (no pandas import, no DataFrame).
+
+    Only used when pandas would keep every column as strings: values stay strings and missing values become None.
+    Returns None (the caller falls back to pandas) when a column could be inferred as numeric/boolean or is entirely
+    missing, or when the header/row shape needs pandas' handling (duplicate or empty names, extra fields).
+    """
+    with manifest_path.open(newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f, delimiter=sep)
+        header = next(reader, None)
+        if header is None:
+            return [], []
+        n = len(header)
+        if len(set(header)) != n or "" in header:
+            return None
+        na = _CSV_NA_VALUES
+        # Columns whose non-missing values all look numeric/boolean so far (pandas would convert those).
+        convertible = set(range(n))
+        rows: list[dict[str, Any]] = []
+        for values in reader:
+            if not values:  # blank line (skipped like pandas' skip_blank_lines)
+                continue
+            if len(values) > n:
+                return None
+            if len(values) < n:
+                values = values + [""] * (n - len(values))
+            if convertible:
+                for i in tuple(convertible):
+                    v = values[i]
+                    if v not in na and not _csv_value_may_convert(v):
+                        convertible.discard(i)
+            rows.append({k: (None if v in na else v) for k, v in zip(header, values)})
+    if convertible and rows:
+        return None
+    return rows, header
 
 
 def read_rows_from_manifest(manifest_path: Path, sheet_name: str | None) -> tuple[list[dict[str, Any]], list[str]]:
+    suffix = manifest_path.suffix.lower()
+    if suffix in {".csv", ".tsv"}:
+        if sheet_name:
+            print("Warning: --sheet is ignored for .csv/.tsv input", file=sys.stderr)
+        parsed = _read_rows_from_csv(manifest_path, "\t" if suffix == ".tsv" else ",")
+        if parsed is not None:
+            return parsed
+
     try:
+        import numpy as np
         import pandas as pd
     except Exception as e:  # pragma: no cover
         raise RuntimeError("pandas is required. Install dependencies first.") from e
 
-    suffix = manifest_path.suffix.lower()
     if suffix in {".xlsx", ".xlsm", ".xls"}:
         kwargs: dict[str, Any] = {}
         if sheet_name:
             kwargs["sheet_name"] = sheet_name
         try:
-            # Use cached values for formulas (Excel add-ins/custom functions are not evaluated here).
+            # Use cached values for formulas (Excel add-ins/custom functions are not evaluated here), and stream the
+            # sheet (read_only) instead of building openpyxl's full cell graph.
             df = pd.read_excel(
                 manifest_path,
                 engine="openpyxl",
-                engine_kwargs={"data_only": True},
+                engine_kwargs={"read_only": True, "data_only": True},
                 **kwargs,
             )
         except (ImportError, ModuleNotFoundError) as e:
@@ -47,13 +123,23 @@ def read_rows_from_manifest(manifest_path: Path, sheet_name: str | None) -> tupl
         except ValueError as e:
             raise RuntimeError(str(e)) from e
     elif suffix in {".csv", ".tsv"}:
-        if sheet_name:
-            print("Warning: --sheet is ignored for .csv/.tsv input", file=sys.stderr)
         sep = "\t" if suffix == ".tsv" else ","
         df = pd.read_csv(manifest_path, sep=sep)
     else:
         raise RuntimeError(f"Unsupported manifest extension: {manifest_path.suffix}")
 
-    df = df.where(df.notnull(), None)
-    rows: list[dict[str, Any]] = df.to_dict(orient="records")
-    return rows, [str(c) for c in df.columns.to_list()]
+    # Build records column-wise instead of materializing a NaN->None copy of the whole frame and walking it again in
+    # to_dict. Like df.where(df.notnull(), None), numpy float and datetime/timedelta columns keep NaN/NaT.
+    labels = df.columns.to_list()
+    columns: list[list[Any]] = []
+    for i in range(len(labels)):
+        col = df.iloc[:, i]
+        values = col.tolist()
+        kind = col.dtype.kind
+        if not (kind in "mM" or (kind == "f" and isinstance(col.dtype, np.dtype))):
+            missing = col.isna().to_numpy()
+            if missing.any():
+                values = [None if m else v for v, m in zip(values, missing.tolist())]
+        columns.append(values)
+    rows: list[dict[str, Any]] = [dict(zip(labels, record)) for record in zip(*columns)]
+    return rows, [str(c) for c in labels]
@@ -1,9 +1,19 @@
 from __future__ import annotations
 
-import math
 import struct
 
 
+def _copytoken_masks(bit_count: int) -> tuple[int, int, int, int]:
+    length_mask = 0xFFFF >> bit_count
+    offset_mask = (~length_mask) & 0xFFFF
+    maximum_length = (0xFFFF >> bit_count) + 3
+    return length_mask, offset_mask, bit_count, maximum_length
+
+
+# bit_count only takes the values 4..12 inside a 4096-byte chunk.
+_COPYTOKEN_TABLE = [_copytoken_masks(bit_count) for bit_count in range(4, 13)]
+
+
 def copytoken_help(decompressed_current: int, decompressed_chunk_start: int) -> tuple[int, int, int, int]:
     """
     Compute bit masks to decode a CopyToken.
@@ -11,16 +21,58 @@ def copytoken_help(decompressed_current: int, decompressed_chunk_start: int) ->
     Ported (with minor guards) from oletools.olevba.copytoken_help.
     """
     difference = decompressed_current - decompressed_chunk_start
-    if difference <= 0:
-        bit_count = 4
-    else:
-        bit_count = int(math.ceil(math.log(difference, 2)))
-        bit_count = max(bit_count, 4)
+    # ceil(log2(difference)) == (difference - 1).bit_length() for difference >= 1, without float math.
+    bit_count = max((difference - 1).bit_length(), 4) if difference > 0 else 4
+    if bit_count <= 12:
+        return _COPYTOKEN_TABLE[bit_count - 4]
+    return _copytoken_masks(bit_count)
 
-    length_mask = 0xFFFF >> bit_count
-    offset_mask = (~length_mask) & 0xFFFF
-    maximum_length = (0xFFFF >> bit_count) + 3
-    return length_mask, offset_mask, bit_count, maximum_length
+
+def _decompress_chunk(data: bytes | bytearray, pos: int, end: int, out: bytearray) -> None:
+    """
+    Decode the token sequence of one compressed chunk (`data[pos:end]`, header excluded) onto `out`.
+
+    This is the hot loop of decompress_stream: names are bound locally and CopyTokens are read with integer
+    arithmetic instead of struct.unpack_from.
+    """
+    append = out.append
+    chunk_start = len(out)
+    # copytoken_help inlined: bit_count only grows within a chunk, so it is bumped whenever the decompressed
+    # chunk length passes the next power of two.
+    bit_count = 4
+    bit_limit = 1 << bit_count
+    while pos < end:
+        flag_byte = data[pos]
+        pos += 1
+        if not flag_byte and pos + 8 <= end:
+            # Eight LiteralTokens (common in VBA source text): copy them in one slice.
+            out += data[pos : pos + 8]
+            pos += 8
+            continue
+        for bit_index in range(8):
+            if pos >= end:
+                break
+            if not (flag_byte >> bit_index) & 1:  # LiteralToken
+                append(data[pos])
+                pos += 1
+                continue
+            # CopyToken
+            if pos + 2 > end:
+                raise ValueError("Truncated CopyToken in VBA compressed stream")
+            copy_token = data[pos] | (data[pos + 1] << 8)
+            pos += 2
+            out_len = len(out)
+            while out_len - chunk_start > bit_limit:
+                bit_count += 1
+                bit_limit <<= 1
+            length = (copy_token & (0xFFFF >> bit_count)) + 3
+            offset = (copy_token >> (16 - bit_count)) + 1
+            copy_source = out_len - offset
+            if length <= offset:
+                out += out[copy_source : copy_source + length]
+            else:
+                # Overlapping copy (RLE): the output repeats the last `offset` bytes with period `offset`.
+                out += (out[copy_source:] * (length // offset + 1))[:length]
 
 
 def decompress_stream(compressed_container: bytes | bytearray) -> bytes:
@@ -29,9 +81,7 @@ def decompress_stream(compressed_container: bytes | bytearray) -> bytes:
 
     Ported from oletools.olevba.decompress_stream (Python implementation).
     """
-    if not isinstance(compressed_container, bytearray):
-        compressed_container = bytearray(compressed_container)
-
+    # bytes and bytearray index the same way, so the input is read in place rather than copied.
     if not compressed_container:
         return b""
 
@@ -69,32 +119,8 @@ def decompress_stream(compressed_container: bytes | bytearray) -> bytes:
             compressed_current += 4096
             continue
 
-        decompressed_chunk_start = len(decompressed_container)
-        while compressed_current < compressed_end:
-            flag_byte = compressed_container[compressed_current]
-            compressed_current += 1
-            for bit_index in range(8):
-                if compressed_current >= compressed_end:
-                    break
-                flag_bit = (flag_byte >> bit_index) & 1
-                if flag_bit == 0:  # LiteralToken
-                    decompressed_container.append(compressed_container[compressed_current])
-                    compressed_current += 1
-                else:  # CopyToken
-                    if compressed_current + 2 > compressed_end:
-                        raise ValueError("Truncated CopyToken in VBA compressed stream")
-                    copy_token = struct.unpack_from("<H", compressed_container, compressed_current)[0]
-                    length_mask, offset_mask, bit_count, _ = copytoken_help(
-                        len(decompressed_container), decompressed_chunk_start
-                    )
-                    length = (copy_token & length_mask) + 3
-                    temp1 = copy_token & offset_mask
-                    temp2 = 16 - bit_count
-                    offset = (temp1 >> temp2) + 1
-                    copy_source = len(decompressed_container) - offset
-                    for index in range(copy_source, copy_source + length):
-                        decompressed_container.append(decompressed_container[index])
-                    compressed_current += 2
+        _decompress_chunk(compressed_container, compressed_current, compressed_end, decompressed_container)
+        compressed_current = compressed_end
 
     return bytes(decompressed_container)
 
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 import json
+import os
 import tempfile
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson  # optional, faster payload.json parsing
+except Exception:
+    orjson = None  # type: ignore[assignment]
+
 
 class PayloadError(RuntimeError):
     pass
@@ -15,6 +21,8 @@ class PayloadError(RuntimeError):
 class PayloadMeta:
     root: Path
     meta: dict[str, Any]
+    # abspath() results per key: validation looks the same keys up several times and each lookup costs a resolve().
+    _abspaths: dict[str, Path | None] = field(default_factory=dict, init=False, repr=False, compare=False)
 
     @property
     def payload_version(self) -> int:
@@ -31,10 +39,14 @@ class PayloadMeta:
         return None
 
     def abspath(self, key: str) -> Path | None:
+        try:
+            return self._abspaths[key]
+        except KeyError:
+            pass
         rel = self.relpath(key)
-        if not rel:
-            return None
-        return (self.root / rel).resolve()
+        p = (self.root / rel).resolve() if rel else None
+        self._abspaths[key] = p
+        return p
 
     def exists(self, key: str) -> bool:
         p = self.abspath(key)
@@ -47,7 +59,15 @@ def load_payload_meta(root: str | Path) -> PayloadMeta:
     if not payload_path.exists():
         raise PayloadError(f"payload.json not found: {payload_path}")
     try:
-        meta = json.loads(payload_path.read_text(encoding="utf-8"))
+        data = payload_path.read_bytes()
+        meta = None
+        if orjson is not None:
+            try:
+                meta = orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass  # e.g. NaN/Infinity literals, which the stdlib parser accepts
+        if meta is None:
+            meta = json.loads(data.decode("utf-8"))
     except Exception as e:
         raise PayloadError(f"Failed to parse payload.json: {payload_path}") from e
     if not isinstance(meta, dict):
@@ -55,16 +75,52 @@ def load_payload_meta(root: str | Path) -> PayloadMeta:
     return PayloadMeta(root=root_path, meta=meta)
 
 
+def _existing_relpaths(root: Path) -> set[str]:
+    """
+    POSIX relative paths of every existing file/directory under `root` (one scandir per directory).
+
+    Symlinks count when their target exists (like Path.exists()), but symlinked directories are not descended into.
+    """
+    found: set[str] = set()
+    stack = [(str(root), "")]
+    while stack:
+        current, prefix = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            rel = prefix + entry.name
+            try:
+                if entry.is_dir():
+                    found.add(rel)
+                    if not entry.is_symlink():
+                        stack.append((entry.path, rel + "/"))
+                elif entry.is_file():
+                    found.add(rel)
+            except OSError:
+                continue
+    return found
+
+
+# Above this many path_map entries, one walk of the payload tree is cheaper than resolve()+exists() per entry.
+_PATH_MAP_SCAN_THRESHOLD = 64
+
+
 def validate_payload(root: str | Path) -> list[str]:
     """
     Validate payload.json and referenced files. Returns a list of human-readable errors.
     """
-    errors: list[str] = []
     try:
         payload = load_payload_meta(root)
     except PayloadError as e:
         return [str(e)]
+    return _validate_payload_meta(payload)
 
+
+def _validate_payload_meta(payload: PayloadMeta) -> list[str]:
+    errors: list[str] = []
     if payload.payload_version > 1:
         errors.append(f"Unsupported payload_version: {payload.payload_version}")
 
@@ -99,6 +155,9 @@ def validate_payload(root: str | Path) -> list[str]:
     if pm is not None and not isinstance(pm, dict):
         errors.append("path_map must be an object (raw path -> relative path)")
     elif isinstance(pm, dict):
+        # A hit in the scanned set proves existence; anything else (misses, "../x", "./x", symlinked dirs, ...)
+        # still gets the exact resolve()+exists() check.
+        present = _existing_relpaths(payload.root) if len(pm) > _PATH_MAP_SCAN_THRESHOLD else set()
         for raw, rel in list(pm.items())[:2000]:
             if not isinstance(raw, str) or not isinstance(rel, str):
                 errors.append("path_map contains non-string key/value")
@@ -106,6 +165,8 @@ def validate_payload(root: str | Path) -> list[str]:
             if not rel.strip():
                 errors.append(f"path_map has empty value for: {raw!r}")
                 break
+            if rel in present:
+                continue
             p = (payload.root / rel).resolve()
             if not p.exists():
                 errors.append(f"path_map points to missing file: {raw!r} -> {rel}")
@@ -122,14 +183,14 @@ def validate_payload_deep(root: str | Path) -> list[str]:
     - re-run processing in a temporary directory using payload path_map as fallback
     This checks that the dataset payload is actually reproducible on another machine.
     """
-    errors = validate_payload(root)
-    if errors:
-        return errors
-
+    # payload.json is parsed once and shared by the shallow checks and the deep ones.
     try:
         payload = load_payload_meta(root)
     except PayloadError as e:
         return [str(e)]
+    errors = _validate_payload_meta(payload)
+    if errors:
+        return errors
 
     spec_path = payload.abspath("spec_path")
     if spec_path is None:
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import fnmatch
+import os
+import re
+import stat
 import sys
 from dataclasses import dataclass
 from pathlib import Path
@@ -7,7 +11,7 @@ from typing import Any, Iterable, Mapping, Sequence
 
 from .template import render_dataset_path_template
 from .utils import is_url, non_empty_str, resolve_local_base_folder
-from .wildcards import has_glob_magic, matches_any_wildcard, split_glob_root_and_pattern
+from .wildcards import compile_wildcards, has_glob_magic, split_glob_root_and_pattern
 
 
 @dataclass(frozen=True)
@@ -18,6 +22,33 @@ class ResolvedItem:
     wildcard: str | None
 
 
+def _resolve_with_parent_cache(path: Path, cache: dict[str, Path]) -> Path:
+    """
+    Same result as `path.resolve()`, but every directory of the parent chain is resolved once per distinct directory.
+
+    Only the last component is checked per call (one lstat); when it is a symlink the full resolve() runs.
+    """
+    name = path.name
+    if not name or name in (".", ".."):
+        return path.resolve()
+    parent_key = str(path.parent)
+    parent = cache.get(parent_key)
+    if parent is None:
+        parent = cache[parent_key] = _resolve_with_parent_cache(path.parent, cache)
+    candidate = parent / name
+    if os.path.islink(candidate):
+        return candidate.resolve()
+    return candidate
+
+
+def _stat_mode(path: Path) -> int | None:
+    """st_mode of `path` (following symlinks) or None if missing: one stat() instead of exists/is_dir/is_file."""
+    try:
+        return os.stat(path).st_mode
+    except (OSError, ValueError):
+        return None
+
+
 def resolve_items(
     rows: Iterable[Mapping[str, Any]],
     *,
@@ -29,6 +60,9 @@ def resolve_items(
 ) -> tuple[list[ResolvedItem], int]:
     items: list[ResolvedItem] = []
     skipped = 0
+    # Rows usually share a handful of parent folders: resolve each parent chain once.
+    resolved_parents: dict[str, Path] = {}
+    base_resolved = _resolve_with_parent_cache(base_dir.expanduser(), resolved_parents) if base_dir else None
     for i, row in enumerate(rows, start=1):
         raw_path = non_empty_str(row.get(path_col))
         if not raw_path:
@@ -63,17 +97,17 @@ def resolve_items(
             continue
 
         source_path = Path(source_text)
-        if not source_path.is_absolute() and base_dir:
-            source_path = (base_dir / source_path).expanduser().resolve()
+        if not source_path.is_absolute() and base_resolved is not None:
+            source_path = _resolve_with_parent_cache(base_resolved / source_path, resolved_parents)
         else:
-            source_path = source_path.expanduser().resolve()
+            source_path = _resolve_with_parent_cache(source_path.expanduser(), resolved_parents)
 
         wildcard: str | None = None
         template_source_path: Path = source_path
         if has_glob_magic(source_text):
             glob_root, wildcard = split_glob_root_and_pattern(source_path)
             template_source_path = glob_root
-            if not glob_root.exists() or not glob_root.is_dir():
+            if not os.path.isdir(glob_root):
                 if skip_missing:
                     print(f"Warning: Row {i}: glob root not found, skipped: {glob_root}", file=sys.stderr)
                     skipped += 1
@@ -97,7 +131,7 @@ def resolve_items(
             resolved_dataset_path = None
 
         if wildcard is not None:
-            local_base_folder = resolve_local_base_folder(template_source_path, base_dir)
+            local_base_folder = resolve_local_base_folder(template_source_path, base_dir, is_dir=True)
             items.append(
                 ResolvedItem(
                     source=template_source_path.as_posix(),
@@ -108,14 +142,15 @@ def resolve_items(
             )
             continue
 
-        if not source_path.exists():
+        mode = _stat_mode(source_path)
+        if mode is None:
             if skip_missing:
                 print(f"Warning: Row {i}: path not found, skipped: {source_path}", file=sys.stderr)
                 skipped += 1
                 continue
             raise FileNotFoundError(f"Row {i}: path not found: {source_path}")
 
-        local_base_folder = resolve_local_base_folder(source_path, base_dir)
+        local_base_folder = resolve_local_base_folder(source_path, base_dir, is_dir=stat.S_ISDIR(mode))
         items.append(
             ResolvedItem(
                 source=source_path.as_posix(),
@@ -128,13 +163,48 @@ def resolve_items(
     return items, skipped
 
 
+def _scan_files(root: str, *, recursive: bool, name_re: re.Pattern[str] | None) -> list[str]:
+    """
+    Full paths of the files under `root` whose name matches `name_re` (all files when None).
+
+    Same selection as Path.glob/rglob with a single-segment pattern: one scandir per directory, DirEntry type
+    checks reuse readdir data, and (like rglob) symlinked directories are not descended into.
+    """
+    out: list[str] = []
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except PermissionError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_file():
+                    if name_re is None or name_re.match(os.path.normcase(entry.name)):
+                        out.append(entry.path)
+                elif recursive and entry.is_dir() and not entry.is_symlink():
+                    stack.append(entry.path)
+            except OSError:
+                continue
+    return out
+
+
+def _compile_name_wildcards(wildcards: list[str]) -> re.Pattern[str] | None:
+    """One regex for all wildcards when every wildcard matches a single name segment (else None)."""
+    if any("/" in w or os.sep in w or "**" in w for w in wildcards):
+        return None
+    return re.compile("|".join(fnmatch.translate(os.path.normcase(w)) for w in wildcards))
+
+
 def iter_local_files(path: Path, *, recursive: bool) -> list[Path]:
     if path.is_file():
         return [path]
     if not path.is_dir():
         return []
-    iterator = path.rglob("*") if recursive else path.glob("*")
-    return sorted({p for p in iterator if p.is_file()})
+    # The scandir walk yields each file once, so no dedup set is needed.
+    return sorted([Path(p) for p in _scan_files(str(path), recursive=recursive, name_re=None)])
 
 
 def iter_local_files_with_wildcards(path: Path, *, wildcards: list[str] | None, recursive: bool) -> list[Path]:
@@ -145,11 +215,23 @@ def iter_local_files_with_wildcards(path: Path, *, wildcards: list[str] | None,
     if not wildcards:
         return iter_local_files(path, recursive=recursive)
 
-    files: set[Path] = set()
+    name_re = _compile_name_wildcards(wildcards)
+    if name_re is not None:
+        return sorted([Path(p) for p in _scan_files(str(path), recursive=recursive, name_re=name_re)])
+
+    # Different wildcards (or a '**' pattern under rglob) can yield the same file: dedup on the path string, which is
+    # cheaper to hash than Path.
+    seen: set[str] = set()
+    files: list[Path] = []
     for w in wildcards:
         iterator = path.rglob(w) if recursive else path.glob(w)
-        files.update({p for p in iterator if p.is_file()})
-    return sorted(files)
+        for p in iterator:
+            key = str(p)
+            if key not in seen and p.is_file():
+                seen.add(key)
+                files.append(p)
+    files.sort()
+    return files
 
 
 def calc_dataset_relpath(*, file_path: Path, local_base_folder: Path, dataset_path: str | None) -> str:
@@ -168,6 +250,9 @@ def collect_local_dataset_paths(
     collisions: dict[str, list[str]] = {}
     matched_local_files = 0
     excluded_local_files = 0
+    # Same include/exclude lists for every file: compile them once (relpaths below are already POSIX).
+    include_match = compile_wildcards(include, recursive=recursive) if include else None
+    exclude_match = compile_wildcards(exclude, recursive=recursive) if exclude else None
 
     for it in items:
         if is_url(it.source):
@@ -176,17 +261,18 @@ def collect_local_dataset_paths(
         source_path = Path(it.source)
         local_base_folder = Path(it.local_base_folder or source_path.parent)
 
+        mode = _stat_mode(source_path)
         item_wildcards: list[str] | None
         if it.wildcard:
             item_wildcards = [it.wildcard]
-        elif source_path.is_dir() and include:
+        elif mode is not None and stat.S_ISDIR(mode) and include:
             item_wildcards = include
         else:
             item_wildcards = None
 
-        if source_path.is_file():
+        if mode is not None and stat.S_ISREG(mode):
             rel = source_path.relative_to(local_base_folder).as_posix()
-            if include and not matches_any_wildcard(rel, include, recursive=recursive):
+            if include_match is not None and not include_match(rel):
                 files: list[Path] = []
             else:
                 files = [source_path]
@@ -194,19 +280,33 @@ def collect_local_dataset_paths(
             files = iter_local_files_with_wildcards(source_path, wildcards=item_wildcards, recursive=recursive)
 
         matched_local_files += len(files)
+        # Per-file relpaths are plain string slicing when the file sits under the base folder (the usual case);
+        # anything else goes through calc_dataset_relpath for its exact Path semantics (and errors).
+        base_prefix: str | None = None
+        dataset_prefix = ""
+        if os.sep == "/":
+            base_str = str(local_base_folder)
+            prefix = Path(it.dataset_path or ".").as_posix()
+            if not base_str.endswith("/") and not prefix.endswith("/"):
+                base_prefix = base_str + "/"
+                dataset_prefix = "" if prefix == "." else prefix + "/"
         for f in files:
-            dataset_relpath = calc_dataset_relpath(
-                file_path=f, local_base_folder=local_base_folder, dataset_path=it.dataset_path
-            )
-            if exclude and matches_any_wildcard(dataset_relpath, exclude, recursive=recursive):
+            f_posix = f.as_posix()
+            if base_prefix and f_posix.startswith(base_prefix):
+                dataset_relpath = dataset_prefix + f_posix[len(base_prefix) :]
+            else:
+                dataset_relpath = calc_dataset_relpath(
+                    file_path=f, local_base_folder=local_base_folder, dataset_path=it.dataset_path
+                )
+            if exclude_match is not None and exclude_match(dataset_relpath):
                 excluded_local_files += 1
                 continue
 
             existing = unique_dataset_paths.get(dataset_relpath)
-            if existing and existing != f.as_posix():
-                collisions.setdefault(dataset_relpath, [existing]).append(f.as_posix())
+            if existing and existing != f_posix:
+                collisions.setdefault(dataset_relpath, [existing]).append(f_posix)
             else:
-                unique_dataset_paths.setdefault(dataset_relpath, f.as_posix())
+                unique_dataset_paths.setdefault(dataset_relpath, f_posix)
 
     return unique_dataset_paths, collisions, matched_local_files, excluded_local_files
 
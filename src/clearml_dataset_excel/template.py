@@ -1,47 +1,83 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
+from string import Formatter
+from types import MappingProxyType
 from urllib.parse import urlparse
 from typing import Any, Mapping
 
-from .utils import is_url, try_relative_to
+from .utils import is_url
 
 
 def path_parts_for_template(source_text: str, *, source_path: Path | None, base_dir: Path | None) -> dict[str, str]:
     if is_url(source_text):
-        parsed = urlparse(source_text)
-        parsed_path = Path(parsed.path)
-        basename = parsed_path.name
-        stem = parsed_path.stem
-        suffix = parsed_path.suffix
-        relpath = parsed.path.lstrip("/") or basename
-        return {
-            "basename": basename,
-            "stem": stem,
-            "suffix": suffix,
-            "relpath": relpath,
-            "url": source_text,
-            "scheme": parsed.scheme,
-            "netloc": parsed.netloc,
-        }
-
-    if not source_path:
-        source_path = Path(source_text)
+        return _url_path_parts(source_text)
+    return _local_path_parts(source_path or Path(source_text), base_dir)
 
+
+def _url_path_parts(source_text: str) -> dict[str, str]:
+    parsed = urlparse(source_text)
+    parsed_path = Path(parsed.path)
+    basename = parsed_path.name
+    return {
+        "basename": basename,
+        "stem": parsed_path.stem,
+        "suffix": parsed_path.suffix,
+        "relpath": parsed.path.lstrip("/") or basename,
+        "url": source_text,
+        "scheme": parsed.scheme,
+        "netloc": parsed.netloc,
+    }
+
+
+def _local_path_parts(source_path: Path, base_dir: Path | None) -> dict[str, str]:
     basename = source_path.name
-    stem = source_path.stem
-    suffix = source_path.suffix
     relpath: str = basename
-    if base_dir and try_relative_to(source_path, base_dir):
-        relpath = source_path.relative_to(base_dir).as_posix()
+    if base_dir:
+        try:
+            relpath = source_path.relative_to(base_dir).as_posix()
+        except ValueError:
+            pass
     return {
         "basename": basename,
-        "stem": stem,
-        "suffix": suffix,
+        "stem": source_path.stem,
+        "suffix": source_path.suffix,
         "relpath": relpath,
     }
 
 
+# Rows of a manifest share few distinct sources: the (pure) path parts are computed once per source. The cached
+# mapping is read-only; path_parts_for_template() itself keeps returning a fresh dict.
+@lru_cache(maxsize=4096)
+def _cached_path_parts(source_text: str, source_path: Path | None, base_dir: Path | None) -> Mapping[str, str]:
+    return MappingProxyType(path_parts_for_template(source_text, source_path=source_path, base_dir=base_dir))
+
+
+_CONVERTERS = {"r": repr, "s": str, "a": ascii}
+_PATH_PART_KEYS = frozenset(("basename", "stem", "suffix", "relpath", "url", "scheme", "netloc"))
+
+
+@lru_cache(maxsize=16)
+def _compile_template(template: str) -> tuple[tuple[tuple[Any, ...], ...], frozenset[str]] | None:
+    """
+    Parse a dataset path template once into (literal, field_name, format_spec, conversion) chunks plus the set of
+    referenced names. Returns None when the template needs full str.format() semantics (positional fields,
+    attribute/index access, nested format specs, unknown conversions).
+    """
+    chunks = tuple(Formatter().parse(template))
+    names: set[str] = set()
+    for _, name, spec, conversion in chunks:
+        if name is None:
+            continue
+        if not name or "." in name or "[" in name or name.isdecimal() or "{" in (spec or ""):
+            return None
+        if conversion is not None and conversion not in _CONVERTERS:
+            return None
+        names.add(name)
+    return chunks, frozenset(names)
+
+
 def render_dataset_path_template(
     template: str,
     row: Mapping[str, Any],
@@ -51,12 +87,36 @@ def render_dataset_path_template(
     source_path: Path | None,
     base_dir: Path | None,
 ) -> str:
-    values = dict(row)
-    values.update(path_parts_for_template(source_text, source_path=source_path, base_dir=base_dir))
-    try:
-        rendered = template.format(**values)
-    except KeyError as e:
-        key = e.args[0]
-        raise ValueError(f"Row {row_index}: dataset path template is missing key: {key}") from e
-    return rendered.strip().lstrip("/")
+    compiled = _compile_template(template)
+    if compiled is None:
+        values = dict(row)
+        values.update(_cached_path_parts(source_text, source_path, base_dir))
+        try:
+            rendered = template.format(**values)
+        except KeyError as e:
+            key = e.args[0]
+            raise ValueError(f"Row {row_index}: dataset path template is missing key: {key}") from e
+        return rendered.strip().lstrip("/")
+
+    # Only the referenced fields are looked up (path parts take precedence over row values, as before); the path
+    # parts are not computed at all when the template does not reference any of them.
+    chunks, names = compiled
+    parts: Mapping[str, Any] = {}
+    if names & _PATH_PART_KEYS:
+        parts = _cached_path_parts(source_text, source_path, base_dir)
+    out: list[str] = []
+    for literal, name, spec, conversion in chunks:
+        out.append(literal)
+        if name is None:
+            continue
+        if name in parts:
+            value = parts[name]
+        elif name in row:
+            value = row[name]
+        else:
+            raise ValueError(f"Row {row_index}: dataset path template is missing key: {name}")
+        if conversion:
+            value = _CONVERTERS[conversion](value)
+        out.append(format(value, spec or ""))
+    return "".join(out).strip().lstrip("/")
 
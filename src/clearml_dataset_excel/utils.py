@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -14,9 +16,13 @@ def non_empty_str(value: Any) -> str | None:
     return text or None
 
 
+_URL_PREFIXES = ("http://", "https://", "s3://", "gs://", "azure://", "file://")
+_URL_PREFIX_MAX_LEN = max(len(p) for p in _URL_PREFIXES)
+
+
 def is_url(text: str) -> bool:
-    lowered = text.lower()
-    return lowered.startswith(("http://", "https://", "s3://", "gs://", "azure://", "file://"))
+    # Schemes are usually lowercase already; otherwise lowercase only the prefix, not the whole string.
+    return text.startswith(_URL_PREFIXES) or text[:_URL_PREFIX_MAX_LEN].lower().startswith(_URL_PREFIXES)
 
 
 def try_relative_to(path: Path, base: Path) -> bool:
@@ -27,20 +33,66 @@ def try_relative_to(path: Path, base: Path) -> bool:
         return False
 
 
-def resolve_local_base_folder(source_path: Path, base_dir: Path | None) -> Path:
+def resolve_local_base_folder(source_path: Path, base_dir: Path | None, *, is_dir: bool | None = None) -> Path:
+    """`is_dir` lets callers that already stat'ed `source_path` skip the extra is_dir() call."""
     if base_dir and try_relative_to(source_path, base_dir):
         return base_dir
-    if source_path.is_dir():
+    if source_path.is_dir() if is_dir is None else is_dir:
         return source_path
     return source_path.parent
 
 
+_QUARANTINE_XATTR = b"com.apple.quarantine"
+
+
+@lru_cache(maxsize=1)
+def _darwin_libc() -> Any:
+    """
+    libc with the macOS xattr functions typed, or None if unavailable.
+
+    Python's os.getxattr/os.removexattr only exist on Linux, so on macOS the syscalls are reached through ctypes
+    (instead of spawning the `xattr` CLI per file).
+    """
+    try:
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.dylib", use_errno=True)
+        libc.getxattr.argtypes = [
+            ctypes.c_char_p,
+            ctypes.c_char_p,
+            ctypes.c_void_p,
+            ctypes.c_size_t,
+            ctypes.c_uint32,
+            ctypes.c_int,
+        ]
+        libc.getxattr.restype = ctypes.c_ssize_t
+        libc.removexattr.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+        libc.removexattr.restype = ctypes.c_int
+        return libc
+    except Exception:
+        return None
+
+
 def get_macos_quarantine(path: Path) -> str | None:
     """
     Return the macOS quarantine xattr value (com.apple.quarantine) if present, else None.
     """
     if sys.platform != "darwin":
         return None
+    libc = _darwin_libc()
+    if libc is not None:
+        import ctypes
+
+        p = os.fsencode(path)
+        size = libc.getxattr(p, _QUARANTINE_XATTR, None, 0, 0, 0)
+        if size <= 0:
+            return None
+        buf = ctypes.create_string_buffer(size)
+        n = libc.getxattr(p, _QUARANTINE_XATTR, buf, size, 0, 0)
+        if n <= 0:
+            return None
+        return buf.raw[:n].decode("utf-8", "replace").strip() or None
     try:
         import subprocess
 
@@ -66,6 +118,9 @@ def clear_macos_quarantine(path: Path) -> bool:
     """
     if sys.platform != "darwin":
         return False
+    libc = _darwin_libc()
+    if libc is not None:
+        return libc.removexattr(os.fsencode(path), _QUARANTINE_XATTR, 0) == 0
     try:
         import subprocess
 
@@ -1,34 +1,54 @@
 from __future__ import annotations
 
+import os
+from functools import lru_cache
 from pathlib import Path
 
 from . import __version__ as _ADDIN_VERSION
 
 
-def generate_vba_module(*, meta_sheet_name: str, module_name: str = "ClearMLDatasetExcelAddin") -> str:
-    mod = module_name.replace('"', '""')
-    meta = meta_sheet_name.replace('"', '""')
-    ver = str(_ADDIN_VERSION).replace('"', '""')
-    return f'''Attribute VB_Name = "{mod}"
+# %-style placeholders: mod (module name), meta (meta sheet name), ver (add-in version), all VBA-quoted. A literal
+# percent sign in the VBA source must be written as %%.
+_VBA_TEMPLATE = '''Attribute VB_Name = "%(mod)s"
 Option Explicit
 
-Private Const META_SHEET As String = "{meta}"
+Private Const META_SHEET As String = "%(meta)s"
 Private Const LOG_FILENAME As String = "clearml_dataset_excel_addin.log"
-Private Const ADDIN_VERSION As String = "{ver}"
+Private Const ADDIN_VERSION As String = "%(ver)s"
+
+' Meta sheet key -> value, built once per run (see LoadMetaCache).
+Private gMetaWb As Workbook
+Private gMetaIndex As Collection
 
 Public Sub ClearMLDatasetExcel_Run()
+    ' Keep Excel from repainting, recalculating or firing events while the meta sheet is read; the previous
+    ' settings are restored on every exit path (including Esc, via EnableCancelKey).
+    Dim prevScreenUpdating As Boolean
+    Dim prevEnableEvents As Boolean
+    Dim prevCalculation As Long
+    On Error GoTo EH
+    prevScreenUpdating = Application.ScreenUpdating
+    prevEnableEvents = Application.EnableEvents
+    prevCalculation = Application.Calculation
+    Application.EnableCancelKey = xlErrorHandler
+    Application.ScreenUpdating = False
+    Application.EnableEvents = False
+    Application.Calculation = xlCalculationManual
+
+    ResetMetaCache
+
     Dim targetWb As Workbook
     Set targetWb = ResolveTargetWorkbook()
     If targetWb Is Nothing Then
         MsgBox "Could not find the condition workbook (missing _meta sheet).", vbCritical
-        Exit Sub
+        GoTo CleanUp
     End If
 
     Dim enabled As String
     enabled = LCase$(MetaValue(targetWb, "addin_enabled"))
     If enabled <> "true" And enabled <> "1" And enabled <> "yes" Then
         MsgBox "Add-in is disabled (addin.enabled=false in YAML).", vbExclamation
-        Exit Sub
+        GoTo CleanUp
     End If
 
     Dim expectedVersion As String
@@ -47,14 +67,14 @@ Public Sub ClearMLDatasetExcel_Run()
     wbDir = targetWb.Path
     If wbDir = "" Then
         MsgBox "Please save the workbook before running.", vbExclamation
-        Exit Sub
+        GoTo CleanUp
     End If
 
     Dim specFile As String
     specFile = MetaValue(targetWb, "addin_spec_filename")
     If specFile = "" Then
         MsgBox "Missing meta: addin_spec_filename", vbCritical
-        Exit Sub
+        GoTo CleanUp
     End If
 
     Dim specPath As String
@@ -67,21 +87,39 @@ Public Sub ClearMLDatasetExcel_Run()
     Dim cmdTemplate As String
     cmdTemplate = SelectCommandTemplate(targetWb)
     If cmdTemplate = "" Then
-        cmdTemplate = "clearml-dataset-excel run --spec ""${{SPEC}}"" --excel ""${{EXCEL}}"""
+        cmdTemplate = "clearml-dataset-excel run --spec ""${SPEC}"" --excel ""${EXCEL}"""
     End If
 
     Dim cmd As String
-    ' Support both placeholder styles (single/double braces).
-    cmd = Replace(cmdTemplate, "${{{{SPEC}}}}", specPath)
-    cmd = Replace(cmd, "${{{{EXCEL}}}}", wbPath)
-    cmd = Replace(cmd, "${{SPEC}}", specPath)
-    cmd = Replace(cmd, "${{EXCEL}}", wbPath)
+    cmd = cmdTemplate
+    ' Support both placeholder styles (single/double braces). Templates generated by this version already use
+    ' single braces in the meta sheet; the double-brace passes only run for older workbooks.
+    If InStr(1, cmd, "${{", vbBinaryCompare) > 0 Then
+        cmd = Replace(Replace(cmd, "${{SPEC}}", specPath), "${{EXCEL}}", wbPath)
+    End If
+    cmd = Replace(Replace(cmd, "${SPEC}", specPath), "${EXCEL}", wbPath)
 
 #If Mac Then
     RunOnMac cmd, wbDir
 #Else
     RunOnWindows cmd, wbDir
 #End If
+
+CleanUp:
+    On Error Resume Next
+    ResetMetaCache
+    If prevCalculation <> 0 Then Application.Calculation = prevCalculation
+    Application.EnableEvents = prevEnableEvents
+    Application.ScreenUpdating = prevScreenUpdating
+    Application.EnableCancelKey = xlInterrupt
+    Exit Sub
+EH:
+    If Err.Number = 18 Then
+        MsgBox "Cancelled.", vbExclamation
+    Else
+        MsgBox "ClearML Dataset Excel add-in failed:" & vbCrLf & Err.Description, vbCritical
+    End If
+    Resume CleanUp
 End Sub
 
 Public Sub ClearMLDatasetExcel_Run_Ribbon(ByVal control As Object)
@@ -190,23 +228,61 @@ End Function
 
 
 Private Function MetaValue(ByVal wb As Workbook, ByVal key As String) As String
+    MetaValue = ""
+    If Not (gMetaWb Is wb) Then LoadMetaCache wb
+    If gMetaIndex Is Nothing Or key = "" Then Exit Function
+    On Error Resume Next
+    MetaValue = gMetaIndex.Item(key)
+    On Error GoTo 0
+End Function
+
+Private Sub LoadMetaCache(ByVal wb As Workbook)
+    ' One Variant-array read of columns A:B, indexed by key (Collection keys are case-insensitive, and unlike
+    ' Scripting.Dictionary a Collection is also available on Mac).
     Dim ws As Worksheet
-    Dim found As Range
+    Dim arr As Variant
+    Dim lastRow As Long
+    Dim i As Long
+    Dim idx As Collection
+    Set gMetaWb = wb
+    Set gMetaIndex = Nothing
     On Error GoTo EH
     Set ws = ResolveMetaWorksheet(wb)
-    If ws Is Nothing Then
-        MetaValue = ""
-        Exit Function
-    End If
-    Set found = ws.Columns(1).Find(What:=key, LookIn:=xlValues, LookAt:=xlWhole)
-    If found Is Nothing Then
-        MetaValue = ""
-        Exit Function
-    End If
-    MetaValue = CStr(found.Offset(0, 1).Value)
-    Exit Function
+    If ws Is Nothing Then Exit Sub
+    lastRow = ws.Cells(ws.Rows.Count, 1).End(xlUp).Row
+    arr = ws.Range(ws.Cells(1, 1), ws.Cells(lastRow, 2)).Value
+
+    ' Same precedence as Columns(1).Find(LookAt:=xlWhole): rows below A1 first, A1 last; the first occurrence wins.
+    Set idx = New Collection
+    For i = 2 To lastRow
+        AddMetaKey idx, arr(i, 1), arr(i, 2)
+    Next i
+    AddMetaKey idx, arr(1, 1), arr(1, 2)
+    Set gMetaIndex = idx
+    Exit Sub
 EH:
-    MetaValue = ""
+    Set gMetaIndex = Nothing
+End Sub
+
+Private Sub ResetMetaCache()
+    Set gMetaWb = Nothing
+    Set gMetaIndex = Nothing
+End Sub
+
+Private Sub AddMetaKey(ByVal idx As Collection, ByVal k As Variant, ByVal v As Variant)
+    If IsError(k) Then Exit Sub
+    If CStr(k) = "" Then Exit Sub
+    On Error Resume Next
+    idx.Add MetaCellText(v), CStr(k)  ' duplicate key: keep the first one
+    On Error GoTo 0
+End Sub
+
+Private Function MetaCellText(ByVal v As Variant) As String
+    If IsError(v) Then
+        MetaCellText = ""
+    Else
+        MetaCellText = CStr(v)
+    End If
 End Function
 
 
@@ -303,8 +379,42 @@ End Function
 '''
 
 
+def generate_vba_module(*, meta_sheet_name: str, module_name: str = "ClearMLDatasetExcelAddin") -> str:
+    return _render_vba_module(meta_sheet_name, module_name)
+
+
+def _vba_quote(s: str) -> str:
+    """Escape `s` for a VBA string literal (names rarely contain quotes, so usually no copy is made)."""
+    return s.replace('"', '""') if '"' in s else s
+
+
+# A run writes the same module (same meta sheet/module name) next to every generated workbook: render it once.
+@lru_cache(maxsize=8)
+def _render_vba_module(meta_sheet_name: str, module_name: str) -> str:
+    mod = _vba_quote(module_name)
+    meta = _vba_quote(meta_sheet_name)
+    ver = _vba_quote(str(_ADDIN_VERSION))
+    return _VBA_TEMPLATE % {"mod": mod, "meta": meta, "ver": ver}
+
+
 def write_vba_module(path: str | Path, *, meta_sheet_name: str, module_name: str = "ClearMLDatasetExcelAddin") -> Path:
     out = Path(path).expanduser().resolve()
     out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(generate_vba_module(meta_sheet_name=meta_sheet_name, module_name=module_name), encoding="utf-8")
+    data = _encode_vba_module(meta_sheet_name, module_name)
+    # Leave an identical file untouched (keeps its mtime, so file watchers/Excel do not see a change).
+    try:
+        if out.stat().st_size == len(data) and out.read_bytes() == data:
+            return out
+    except OSError:
+        pass
+    out.write_bytes(data)
     return out
+
+
+@lru_cache(maxsize=8)
+def _encode_vba_module(meta_sheet_name: str, module_name: str) -> bytes:
+    # Same bytes write_text(encoding="utf-8") produced, including its platform newline translation.
+    text = _render_vba_module(meta_sheet_name, module_name)
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    return text.encode("utf-8")
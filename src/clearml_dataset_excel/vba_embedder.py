@@ -289,7 +289,7 @@ def _rewrite_zip_in_place(path: Path, *, replacements: dict[str, bytes]) -> None
 def _embed_vba_from_vba_project_bin(*, excel_path: Path, vba_bin: bytes, overwrite: bool) -> None:
     try:
         with zipfile.ZipFile(excel_path, "r") as z:
-            names = set(z.namelist())
+            names = z.NameToInfo
             has_vba_project = "xl/vbaProject.bin" in names
 
             ct_xml = z.read("[Content_Types].xml")
@@ -379,7 +379,7 @@ def _embed_vba_from_template_excel(*, excel_path: Path, template_excel: Path, ov
 
     try:
         with zipfile.ZipFile(template_excel, "r") as donor:
-            donor_names = set(donor.namelist())
+            donor_names = donor.NameToInfo
             if "xl/vbaProject.bin" not in donor_names:
                 raise RuntimeError(f"VBA template does not contain xl/vbaProject.bin: {template_excel}")
             vba_bin = donor.read("xl/vbaProject.bin")
@@ -540,7 +540,7 @@ def embed_vba_module_into_xlsm(
             # without loading the bundled default vbaProject.bin.
             try:
                 with zipfile.ZipFile(xlsm, "r") as z:
-                    if "xl/vbaProject.bin" in set(z.namelist()):
+                    if "xl/vbaProject.bin" in z.NameToInfo:
                         existing_vba = z.read("xl/vbaProject.bin")
 
                         # Repair older templates that embedded the bundled donor VBA project.
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import glob
-from fnmatch import fnmatch
+import os
+import re
+from fnmatch import fnmatch, translate
 from pathlib import Path
+from typing import Callable
 
 
 def matches_any_wildcard(path: str, wildcards: str | list[str] | None, *, recursive: bool = True) -> bool:
@@ -31,6 +34,50 @@ def matches_any_wildcard(path: str, wildcards: str | list[str] | None, *, recurs
     return False
 
 
+def compile_wildcards(wildcards: str | list[str] | None, *, recursive: bool = True) -> Callable[[str], bool]:
+    """
+    Return a predicate equivalent to `matches_any_wildcard(path, wildcards, recursive=recursive)` with every
+    pattern compiled once, for matching many paths against the same wildcards.
+
+    `path` must already be in POSIX form (e.g. from `Path.as_posix()`).
+    """
+    if wildcards is None:
+        wildcards = ["*"]
+    if not isinstance(wildcards, list):
+        wildcards = [wildcards]
+    wildcards = [str(w) for w in wildcards]
+    norm = os.path.normcase
+
+    if not recursive:
+        by_depth: dict[int, list[list[re.Pattern[str]]]] = {}
+        for wildcard in wildcards:
+            segments = wildcard.split("/")
+            by_depth.setdefault(len(segments), []).append([re.compile(translate(norm(w))) for w in segments])
+
+        def match_segments(path: str) -> bool:
+            path_segments = [norm(p) for p in path.split("/")]
+            for compiled in by_depth.get(len(path_segments), ()):
+                if all(r.match(p) for r, p in zip(compiled, path_segments)):
+                    return True
+            return False
+
+        return match_segments
+
+    # Both conditions of the recursive rule are checked on "/" + path: fnmatch(path, dir) <=> fnmatch("/" + path,
+    # "/" + dir). Each wildcard becomes two lookaheads, and all wildcards are joined into one alternation.
+    alternatives = []
+    for wildcard in wildcards:
+        wildcard_file = wildcard.split("/")[-1]
+        wildcard_dir = wildcard[: -len(wildcard_file)] + "*"
+        alternatives.append(f"(?={translate(norm('/' + wildcard_dir))})(?={translate(norm('*/' + wildcard_file))})")
+    pattern = re.compile("|".join(alternatives))
+
+    def match_recursive(path: str) -> bool:
+        return pattern.match(norm("/" + path)) is not None
+
+    return match_recursive
+
+
 def has_glob_magic(text: str) -> bool:
     return glob.has_magic(text)
 
@@ -1,3 +1,4 @@
+import json
 import sys
 import tempfile
 import unittest
@@ -121,6 +122,51 @@ class TestCliPayloadValidate(unittest.TestCase):
             self.assertEqual(rc, 1)
             self.assertIn("Missing file for template_excel", err.getvalue())
 
+    def test_payload_validate_large_path_map(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            (root / "spec").mkdir()
+            (root / "template").mkdir()
+            (root / "files" / "sub").mkdir(parents=True)
+            (root / "spec" / "spec.yaml").write_text("schema_version: 1\n", encoding="utf-8")
+            (root / "template" / "t.xlsm").write_text("dummy", encoding="utf-8")
+
+            path_map = {}
+            for i in range(100):
+                (root / "files" / "sub" / f"m{i}.csv").write_text("x", encoding="utf-8")
+                path_map[f"/orig/m{i}.csv"] = f"files/sub/m{i}.csv"
+            path_map["/orig/dotted.csv"] = "./files/sub/m0.csv"
+            meta = {"payload_version": 1, "spec_path": "spec/spec.yaml", "template_excel": "template/t.xlsm"}
+            (root / "payload.json").write_text(json.dumps({**meta, "path_map": path_map}), encoding="utf-8")
+            rc = main(["payload", "validate", "--root", root.as_posix()])
+            self.assertEqual(rc, 0)
+
+            path_map["/orig/gone.csv"] = "files/sub/gone.csv"
+            (root / "payload.json").write_text(json.dumps({**meta, "path_map": path_map}), encoding="utf-8")
+            err = StringIO()
+            with redirect_stderr(err):
+                rc = main(["payload", "validate", "--root", root.as_posix()])
+            self.assertEqual(rc, 1)
+            self.assertIn("path_map points to missing file", err.getvalue())
+
+    def test_payload_validate_accepts_non_finite_json_numbers(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            (root / "spec").mkdir()
+            (root / "template").mkdir()
+            (root / "spec" / "spec.yaml").write_text("schema_version: 1\n", encoding="utf-8")
+            (root / "template" / "t.xlsm").write_text("dummy", encoding="utf-8")
+            # json.dumps emits NaN literals; the loader must keep accepting what it always accepted.
+            meta = {
+                "payload_version": 1,
+                "spec_path": "spec/spec.yaml",
+                "template_excel": "template/t.xlsm",
+                "extra": float("nan"),
+            }
+            (root / "payload.json").write_text(json.dumps(meta), encoding="utf-8")
+            rc = main(["payload", "validate", "--root", root.as_posix()])
+            self.assertEqual(rc, 0)
+
 
 if __name__ == "__main__":
     unittest.main()
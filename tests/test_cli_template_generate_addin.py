@@ -34,7 +34,7 @@ class TestCliTemplateGenerateAddin(unittest.TestCase):
                         "  spec_filename: spec_copy.yaml",
                         "  vba_module_filename: addin.bas",
                         "  command_mac: 'echo mac ${SPEC} ${EXCEL}'",
-                        "  command_windows: 'echo win ${SPEC} ${EXCEL}'",
+                        "  command_windows: 'echo win ${{SPEC}} ${{EXCEL}}'",
                         "condition:",
                         "  columns:",
                         "    - {name: id, type: str}",
@@ -66,6 +66,9 @@ class TestCliTemplateGenerateAddin(unittest.TestCase):
             self.assertEqual(meta["B12"].value, _ADDIN_VERSION)
             self.assertEqual(info["A17"].value, "addin_version")
             self.assertEqual(info["B17"].value, _ADDIN_VERSION)
+            # Double-brace placeholders are stored in the single-brace form the macros substitute.
+            self.assertEqual(meta["B7"].value, "echo mac ${SPEC} ${EXCEL}")
+            self.assertEqual(meta["B8"].value, "echo win ${SPEC} ${EXCEL}")
 
     def test_template_generate_with_base_excel_preserves_extra_sheets(self) -> None:
         with tempfile.TemporaryDirectory() as td:
@@ -11,9 +11,14 @@ SRC = ROOT / "src"
 sys.path.insert(0, str(SRC))
 
 from clearml_dataset_excel.manifest import read_rows_from_manifest  # noqa: E402
-from clearml_dataset_excel.resolver import ResolvedItem, collect_local_dataset_paths, resolve_items  # noqa: E402
+from clearml_dataset_excel.resolver import (  # noqa: E402
+    ResolvedItem,
+    collect_local_dataset_paths,
+    iter_local_files_with_wildcards,
+    resolve_items,
+)
 from clearml_dataset_excel.template import path_parts_for_template, render_dataset_path_template  # noqa: E402
-from clearml_dataset_excel.wildcards import matches_any_wildcard  # noqa: E402
+from clearml_dataset_excel.wildcards import compile_wildcards, matches_any_wildcard  # noqa: E402
 
 
 class TestWildcards(unittest.TestCase):
@@ -25,6 +30,19 @@ class TestWildcards(unittest.TestCase):
         self.assertFalse(matches_any_wildcard("dir/file.txt", "*.txt", recursive=False))
         self.assertTrue(matches_any_wildcard("file.txt", "*.txt", recursive=False))
 
+    def test_compile_wildcards_matches_matches_any_wildcard(self) -> None:
+        paths = ["file.txt", "dir/file.txt", "dir/sub/file.jpg", "sub/a.csv", "a/sub/b.csv", ".hidden.txt"]
+        patterns = [None, "*.txt", ["*.jpg", "sub/*.csv"], "*/*.csv", "dir/*", "?ile.txt"]
+        for wildcards in patterns:
+            for recursive in (True, False):
+                match = compile_wildcards(wildcards, recursive=recursive)
+                for path in paths:
+                    self.assertEqual(
+                        match(path),
+                        matches_any_wildcard(path, wildcards, recursive=recursive),
+                        (path, wildcards, recursive),
+                    )
+
 
 class TestTemplate(unittest.TestCase):
     def test_url_parts(self) -> None:
@@ -47,6 +65,23 @@ class TestTemplate(unittest.TestCase):
                 base_dir=None,
             )
 
+    def test_render_template_format_spec_and_path_parts(self) -> None:
+        row = {"split": "train", "idx": 7, "basename": "row-value"}
+        for template, expected in [
+            ("/{split}/{idx:03d}/{basename}", "train/007/a.txt"),
+            ("{split!r}-{stem}{suffix}", "'train'-a.txt"),
+            ("{split[0]}/{{x}}", "t/{x}"),
+        ]:
+            rendered = render_dataset_path_template(
+                template,
+                row,
+                row_index=1,
+                source_text="/tmp/a.txt",
+                source_path=Path("/tmp/a.txt"),
+                base_dir=None,
+            )
+            self.assertEqual(rendered, expected)
+
 
 class TestResolver(unittest.TestCase):
     def test_resolve_items_skip_missing(self) -> None:
@@ -111,6 +146,29 @@ class TestResolver(unittest.TestCase):
             self.assertEqual(excluded, 0)
             self.assertIn("a.txt", collisions)
 
+    def test_iter_local_files_with_wildcards_matches_glob(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            base = Path(td)
+            (base / "sub" / "deep").mkdir(parents=True)
+            for rel in ["a.csv", "b.txt", "sub/c.csv", "sub/deep/d.csv", "sub/deep/e.txt"]:
+                (base / rel).write_text("x")
+
+            for wildcards in (["*.csv"], ["*.csv", "*.txt"], ["sub/*.csv"], None):
+                for recursive in (True, False):
+                    if wildcards is None:
+                        expected = sorted(p for p in (base.rglob("*") if recursive else base.glob("*")) if p.is_file())
+                    else:
+                        expected = sorted(
+                            {
+                                p
+                                for w in wildcards
+                                for p in (base.rglob(w) if recursive else base.glob(w))
+                                if p.is_file()
+                            }
+                        )
+                    got = iter_local_files_with_wildcards(base, wildcards=wildcards, recursive=recursive)
+                    self.assertEqual(got, expected, (wildcards, recursive))
+
 
 class TestManifest(unittest.TestCase):
     def test_read_rows_from_manifest_csv(self) -> None:
@@ -122,6 +180,40 @@ class TestManifest(unittest.TestCase):
             self.assertEqual(cols, ["path", "dataset_path"])
             self.assertEqual(rows[0]["dataset_path"], "train")
 
+    def test_read_rows_from_manifest_csv_missing_values(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            csv_path = Path(td) / "manifest.csv"
+            csv_path.write_text(
+                "path,dataset_path,note\n/tmp/a.txt,NA,x1\n\n/tmp/b.txt,,\n/tmp/c.txt,val\n", encoding="utf-8"
+            )
+            rows, cols = read_rows_from_manifest(csv_path, sheet_name=None)
+            self.assertEqual(cols, ["path", "dataset_path", "note"])
+            self.assertEqual(
+                rows,
+                [
+                    {"path": "/tmp/a.txt", "dataset_path": None, "note": "x1"},
+                    {"path": "/tmp/b.txt", "dataset_path": None, "note": None},
+                    {"path": "/tmp/c.txt", "dataset_path": "val", "note": None},
+                ],
+            )
+
+    def test_read_rows_from_manifest_csv_infers_numbers_like_pandas(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            csv_path = Path(td) / "manifest.csv"
+            csv_path.write_text("path,idx,price\n/tmp/a.txt,1,25.50\n/tmp/b.txt,2,3\n", encoding="utf-8")
+            rows, _ = read_rows_from_manifest(csv_path, sheet_name=None)
+            self.assertEqual(rows[0], {"path": "/tmp/a.txt", "idx": 1, "price": 25.5})
+            self.assertIsInstance(rows[0]["idx"], int)
+            rendered = render_dataset_path_template(
+                "{idx:03d}/{basename}",
+                rows[0],
+                row_index=1,
+                source_text=rows[0]["path"],
+                source_path=None,
+                base_dir=None,
+            )
+            self.assertEqual(rendered, "001/a.txt")
+
     def test_read_rows_from_manifest_excel_cached_formula_value(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             base = Path(td)
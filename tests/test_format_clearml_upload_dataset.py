@@ -1,6 +1,8 @@
 import json
 import sys
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -140,6 +142,71 @@ class TestUploadDataset(unittest.TestCase):
 
             self.assertEqual(ds_id, fake_dataset.id)
 
+    def test_upload_dataset_uses_preloaded_frames_for_stats(self) -> None:
+        import pandas as pd
+
+        with tempfile.TemporaryDirectory() as td:
+            base = Path(td)
+            stage, spec_path, spec = self._make_stage(base)
+            processed = stage / "processed"
+            processed.mkdir(parents=True, exist_ok=True)
+            cond_df = pd.DataFrame({"id": ["s1"], "meas_path": ["m.csv"]})
+            canon_df = pd.DataFrame({"t": [0, 1], "f": [1.0, 2.0], "__condition_row": [0, 0]})
+            cond_df.to_csv(processed / spec.output.conditions_filename, index=False)
+            canon_df.to_csv(processed / spec.output.canonical_filename, index=False)
+
+            fake_dataset = _FakeDataset()
+            tables: list[str] = []
+            logger = fake_dataset.get_logger()
+            logger.report_table = lambda title, series, **k: tables.append(f"{title}/{series}")  # type: ignore[method-assign]
+
+            with patch("clearml.Dataset") as dataset_cls, patch("pandas.read_csv") as read_csv:
+                dataset_cls.get.side_effect = Exception("not found")
+                dataset_cls.create.return_value = fake_dataset
+                upload_dataset(
+                    stage_dir=stage,
+                    spec=spec,
+                    dataset_project="P",
+                    dataset_name="N",
+                    preloaded_frames={"conditions": cond_df, "canonical": canon_df},
+                )
+
+            read_csv.assert_not_called()
+            self.assertIn("Coverage/conditions", tables)
+            self.assertIn("Coverage/canonical", tables)
+
+    def test_upload_dataset_joins_artifact_uploads_on_failure(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            base = Path(td)
+            stage, spec_path, spec = self._make_stage(base)
+
+            uploaded: list[str] = []
+            release = threading.Event()
+
+            class _Task:
+                def upload_artifact(self, name, **kwargs):  # type: ignore[no-untyped-def]
+                    release.wait(5)
+                    time.sleep(0.05)
+                    uploaded.append(name)
+
+            fake_dataset = _FakeDataset()
+            fake_dataset._task = _Task()
+
+            def _add_files(*args, **kwargs):  # type: ignore[no-untyped-def]
+                release.set()
+                raise OSError("add_files failed")
+
+            fake_dataset.add_files = _add_files  # type: ignore[method-assign]
+
+            with patch("clearml.Dataset") as dataset_cls:
+                dataset_cls.get.side_effect = Exception("not found")
+                dataset_cls.create.return_value = fake_dataset
+                with self.assertRaisesRegex(OSError, "add_files failed"):
+                    upload_dataset(stage_dir=stage, spec=spec, dataset_project="P", dataset_name="N")
+
+            # The background uploads had finished by the time the error reached the caller.
+            self.assertEqual(sorted(uploaded), ["condition_template.xlsm", "spec.yaml"])
+
 
 if __name__ == "__main__":
     unittest.main()
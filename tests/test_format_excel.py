@@ -7,7 +7,11 @@ ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 sys.path.insert(0, str(SRC))
 
-from clearml_dataset_excel.format_excel import annotate_template_with_clearml_info, generate_condition_template  # noqa: E402
+from clearml_dataset_excel.format_excel import (  # noqa: E402
+    annotate_template_with_clearml_info,
+    generate_condition_template,
+    generate_condition_template_from_excel,
+)
 from clearml_dataset_excel.format_spec import load_format_spec  # noqa: E402
 
 
@@ -54,6 +58,92 @@ class TestFormatExcel(unittest.TestCase):
             self.assertEqual([c.value for c in ws[1]], ["id", "meas_path"])
             self.assertEqual(wb["_meta"].sheet_state, "hidden")
 
+    def test_generate_condition_template_groups_list_validations(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            base = Path(td)
+            spec_path = base / "spec.yaml"
+            spec_path.write_text(
+                "\n".join(
+                    [
+                        "schema_version: 1",
+                        "condition:",
+                        "  columns:",
+                        "    - {name: a, type: bool}",
+                        "    - {name: b, type: bool}",
+                        "    - {name: c, type: bool, required: true}",
+                        "    - {name: d, type: str, enum: [x, y]}",
+                        "    - {name: meas_path, type: path}",
+                        "files:",
+                        "  - id: meas",
+                        "    path_column: meas_path",
+                        "    mapping: {axes: {}, targets: []}",
+                    ]
+                )
+                + "\n",
+                encoding="utf-8",
+            )
+            spec = load_format_spec(spec_path)
+            generated = generate_condition_template(spec, base / "template.xlsm")
+
+            import openpyxl
+
+            ws = openpyxl.load_workbook(generated)["Conditions"]
+            ranges = sorted(
+                (dv.formula1, bool(dv.allow_blank), str(dv.sqref)) for dv in ws.data_validations.dataValidation
+            )
+            self.assertEqual(
+                ranges,
+                [
+                    ('"TRUE,FALSE"', False, "C2:C1048576"),
+                    ('"TRUE,FALSE"', True, "A2:A1048576 B2:B1048576"),
+                    ('"x,y"', True, "D2:D1048576"),
+                ],
+            )
+
+    def test_generate_condition_template_from_excel_skips_up_to_date_output(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            base = Path(td)
+            spec_path = base / "spec.yaml"
+            spec_lines = [
+                "schema_version: 1",
+                "condition:",
+                "  columns:",
+                "    - {name: id, type: str}",
+                "    - {name: meas_path, type: path}",
+                "files:",
+                "  - id: meas",
+                "    path_column: meas_path",
+                "    mapping: {axes: {}, targets: []}",
+            ]
+            spec_path.write_text("\n".join(spec_lines) + "\n", encoding="utf-8")
+            spec = load_format_spec(spec_path)
+
+            import openpyxl
+
+            base_xlsx = base / "base.xlsx"
+            openpyxl.Workbook().save(base_xlsx)
+            out = base / "out" / "template.xlsx"
+
+            sig = base / "cache" / "template.sig"
+            sig.parent.mkdir()
+
+            # Without a signature path an existing output is never reused.
+            generate_condition_template_from_excel(base_xlsx, spec, out)
+            with self.assertRaises(FileExistsError):
+                generate_condition_template_from_excel(base_xlsx, spec, out)
+
+            generate_condition_template_from_excel(base_xlsx, spec, out, overwrite=True, signature_path=sig)
+            mtime = out.stat().st_mtime_ns
+            # Same inputs: the existing output is returned untouched instead of raising.
+            self.assertEqual(generate_condition_template_from_excel(base_xlsx, spec, out, signature_path=sig), out)
+            self.assertEqual(out.stat().st_mtime_ns, mtime)
+            self.assertEqual(sorted(p.name for p in out.parent.iterdir()), ["template.xlsx"])
+
+            spec_lines[3] = "    - {name: id, type: str, required: true}"
+            spec_path.write_text("\n".join(spec_lines) + "\n", encoding="utf-8")
+            with self.assertRaises(FileExistsError):
+                generate_condition_template_from_excel(base_xlsx, load_format_spec(spec_path), out, signature_path=sig)
+
     def test_annotate_template_with_clearml_info(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             base = Path(td)
@@ -8,7 +8,7 @@ ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 sys.path.insert(0, str(SRC))
 
-from clearml_dataset_excel.format_excel import annotate_template_with_clearml_info  # noqa: E402
+from clearml_dataset_excel.format_excel import _xlsm_contains_vba, annotate_template_with_clearml_info  # noqa: E402
 from clearml_dataset_excel.vba_embedder import embed_vba_module_into_xlsm  # noqa: E402
 
 
@@ -67,6 +67,19 @@ class TestFormatExcelVbaRepair(unittest.TestCase):
                     break
             self.assertEqual(vba_ct, "application/vnd.ms-office.vbaProject")
 
+    def test_xlsm_contains_vba_tracks_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            target = Path(td) / "target.xlsm"
+
+            import openpyxl
+
+            openpyxl.Workbook().save(target)
+            self.assertFalse(_xlsm_contains_vba(target))
+
+            _add_vba_project_bin(target, b"dummy")
+            self.assertTrue(_xlsm_contains_vba(target))
+            self.assertFalse(_xlsm_contains_vba(Path(td) / "missing.xlsm"))
+
 
 if __name__ == "__main__":
     unittest.main()
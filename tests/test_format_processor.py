@@ -2,13 +2,14 @@ import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 sys.path.insert(0, str(SRC))
 
 from clearml_dataset_excel.format_processor import ProcessingError, process_condition_excel  # noqa: E402
-from clearml_dataset_excel.format_spec import load_format_spec  # noqa: E402
+from clearml_dataset_excel.format_spec import Aggregate, load_format_spec  # noqa: E402
 
 
 class TestFormatProcessor(unittest.TestCase):
@@ -143,6 +144,107 @@ class TestFormatProcessor(unittest.TestCase):
             with self.assertRaises(ProcessingError):
                 process_condition_excel(spec, xlsm, output_root=base)
 
+    def test_process_condition_excel_reads_shared_file_once(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            base = Path(td)
+            meas = base / "shared.csv"
+            meas.write_text("time,value\n0,1\n1,3\n", encoding="utf-8")
+
+            spec_path = base / "spec.yaml"
+            spec_path.write_text(
+                "\n".join(
+                    [
+                        "schema_version: 1",
+                        "condition:",
+                        "  columns:",
+                        "    - {name: id, type: str}",
+                        "    - {name: p1, type: path}",
+                        "files:",
+                        "  - id: a",
+                        "    path_column: p1",
+                        "    mapping: {axes: {t: time}, targets: [{name: f1, source: value, type: float}]}",
+                    ]
+                )
+                + "\n",
+                encoding="utf-8",
+            )
+            spec = load_format_spec(spec_path)
+
+            import openpyxl
+
+            xlsm = base / "conditions.xlsm"
+            wb = openpyxl.Workbook()
+            ws = wb.active
+            ws.title = "Conditions"
+            ws.append(["id", "p1"])
+            ws.append(["s1", meas.as_posix()])
+            ws.append(["s2", meas.as_posix()])
+            wb.save(xlsm)
+
+            from clearml_dataset_excel import format_processor
+
+            with mock.patch.object(
+                format_processor, "_read_measurement_file", wraps=format_processor._read_measurement_file
+            ) as read_mock:
+                out = process_condition_excel(spec, xlsm, output_root=base)
+            self.assertEqual(read_mock.call_count, 1)
+
+            self.assertEqual(len(out.canonical_df), 4)
+            self.assertEqual(out.canonical_df["id"].tolist(), ["s1", "s1", "s2", "s2"])
+
+    def test_compute_aggregate_trapz_sorted_and_unsorted(self) -> None:
+        import pandas as pd
+
+        from clearml_dataset_excel.format_processor import _compute_aggregate
+
+        agg = Aggregate(name="i", source="y", op="trapz", wrt="t")
+        sorted_df = pd.DataFrame({"t": [0.0, 1.0, 1.0, 3.0], "y": [0.0, 2.0, 2.0, 2.0]})
+        unsorted_df = sorted_df.iloc[[3, 1, 0, 2]].reset_index(drop=True)
+        self.assertAlmostEqual(_compute_aggregate(sorted_df, agg), 5.0)
+        self.assertAlmostEqual(_compute_aggregate(unsorted_df, agg), 5.0)
+
+    def test_compute_aggregate_trapz_keeps_tied_points_in_input_order(self) -> None:
+        import numpy as np
+        import pandas as pd
+
+        from clearml_dataset_excel.format_processor import _compute_aggregate
+
+        def _previous(df: pd.DataFrame) -> float:
+            # Result of the implementation before the sorted-input shortcut: always argsort, then integrate.
+            x = df["t"].to_numpy(dtype=float)
+            y = df["y"].to_numpy(dtype=float)
+            order = np.argsort(x)
+            trapezoid = getattr(np, "trapezoid", None) or np.trapz
+            return float(trapezoid(y[order], x[order]))
+
+        agg = Aggregate(name="i", source="y", op="trapz", wrt="t")
+        tied_df = pd.DataFrame({"t": [0.0, 1.0, 1.0, 3.0], "y": [0.0, 2.0, 4.0, 0.0]})
+        swapped_df = tied_df.iloc[[0, 2, 1, 3]].reset_index(drop=True)
+        unsorted_df = tied_df.iloc[[3, 0, 1, 2]].reset_index(drop=True)
+        for df, expected in ((tied_df, 5.0), (swapped_df, 4.0), (unsorted_df, 5.0)):
+            self.assertAlmostEqual(_compute_aggregate(df, agg), expected)
+            self.assertAlmostEqual(_compute_aggregate(df, agg), _previous(df))
+
+    def test_fallback_resolve_missing_path_by_basename(self) -> None:
+        from clearml_dataset_excel.format_processor import _fallback_resolve_missing_path, _index_tree
+
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            (root / "a" / "b").mkdir(parents=True)
+            staged = root / "a" / "b" / "000_meas.csv"
+            staged.write_text("x\n", encoding="utf-8")
+            (root / "a" / "other.csv").write_text("x\n", encoding="utf-8")
+            (root / "dup1").mkdir()
+            (root / "dup2").mkdir()
+            (root / "dup1" / "dup.csv").write_text("x\n", encoding="utf-8")
+            (root / "dup2" / "dup.csv").write_text("x\n", encoding="utf-8")
+            _index_tree.cache_clear()
+
+            found = _fallback_resolve_missing_path(raw_path="C:\\elsewhere\\meas.csv", search_root=root)
+            self.assertEqual(found, staged.resolve())
+            self.assertIsNone(_fallback_resolve_missing_path(raw_path="/elsewhere/dup.csv", search_root=root))
+            self.assertIsNone(_fallback_resolve_missing_path(raw_path="/elsewhere/none.csv", search_root=root))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -171,6 +171,28 @@ class TestFormatSpec(unittest.TestCase):
             spec2 = load_format_spec_from_mapping(raw)
             self.assertEqual(spec2, spec1)
 
+    def test_load_format_spec_reuses_parse_until_text_changes(self) -> None:
+        lines = [
+            "schema_version: 1",
+            "condition:",
+            "  columns:",
+            "    - {name: meas_path, type: path}",
+            "files:",
+            "  - id: meas",
+            "    path_column: meas_path",
+            "    mapping: {axes: {t: time}, targets: [{name: f, source: value}]}",
+        ]
+        with tempfile.TemporaryDirectory() as td:
+            spec_path = Path(td) / "spec.yaml"
+            spec_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            spec1 = load_format_spec(spec_path)
+            self.assertIs(load_format_spec(spec_path), spec1)
+
+            spec_path.write_text("\n".join(lines).replace("source: value", "source: val2") + "\n", encoding="utf-8")
+            spec2 = load_format_spec(spec_path)
+            self.assertIsNot(spec2, spec1)
+            self.assertEqual(spec2.files[0].targets[0].source, "val2")
+
 
 if __name__ == "__main__":
     unittest.main()
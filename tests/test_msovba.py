@@ -0,0 +1,45 @@
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+sys.path.insert(0, str(SRC))
+
+from clearml_dataset_excel.msovba import decompress_stream  # noqa: E402
+
+
+def _stream(body: bytes) -> bytes:
+    # SignatureByte + one compressed chunk (flag=1, signature=0b011, size = len(body) + 2 header bytes - 3)
+    header = 0xB000 | (len(body) + 2 - 3)
+    return b"\x01" + header.to_bytes(2, "little") + body
+
+
+class TestMsOvba(unittest.TestCase):
+    def test_decompress_copy_token_without_overlap(self) -> None:
+        # "abcd" + CopyToken(offset=4, length=3)
+        body = bytes([0b10000]) + b"abcd" + (0x3000).to_bytes(2, "little")
+        self.assertEqual(decompress_stream(_stream(body)), b"abcdabc")
+
+    def test_decompress_copy_token_with_overlap(self) -> None:
+        # "ab" + CopyToken(offset=2, length=6): overlapping copy repeats the last two bytes
+        body = bytes([0b100]) + b"ab" + (0x1003).to_bytes(2, "little")
+        self.assertEqual(decompress_stream(_stream(body)), b"abababab")
+
+        # "a" + CopyToken(offset=1, length=5): run of a single byte
+        body = bytes([0b10]) + b"a" + (0x0002).to_bytes(2, "little")
+        self.assertEqual(decompress_stream(_stream(body)), b"aaaaaa")
+
+    def test_decompress_literal_runs(self) -> None:
+        # Two all-literal flag bytes, then a partial group ending in a CopyToken(offset=8, length=3)
+        body = b"\x00" + b"abcdefgh" + b"\x00" + b"ijklmnop" + bytes([0b10]) + b"q" + (0x3800).to_bytes(2, "little")
+        self.assertEqual(decompress_stream(_stream(body)), b"abcdefghijklmnopqjkl")
+        self.assertEqual(decompress_stream(bytearray(_stream(body))), b"abcdefghijklmnopqjkl")
+
+    def test_decompress_rejects_invalid_signature(self) -> None:
+        with self.assertRaises(ValueError):
+            decompress_stream(b"\x02")
+
+
+if __name__ == "__main__":
+    unittest.main()
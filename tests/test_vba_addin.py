@@ -1,4 +1,6 @@
+import os
 import sys
+import tempfile
 import unittest
 from pathlib import Path
 
@@ -6,7 +8,7 @@ ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 sys.path.insert(0, str(SRC))
 
-from clearml_dataset_excel.vba_addin import generate_vba_module  # noqa: E402
+from clearml_dataset_excel.vba_addin import generate_vba_module, write_vba_module  # noqa: E402
 
 
 class TestVbaAddin(unittest.TestCase):
@@ -24,6 +26,28 @@ class TestVbaAddin(unittest.TestCase):
         self.assertIn('"${{SPEC}}"', text)
         self.assertIn('"${{EXCEL}}"', text)
 
+    def test_generate_vba_module_reads_meta_once(self) -> None:
+        text = generate_vba_module(meta_sheet_name="_meta")
+        self.assertNotIn("Find(What:=", text)
+        self.assertIn("arr = ws.Range(ws.Cells(1, 1), ws.Cells(lastRow, 2)).Value", text)
+        self.assertIn("MetaValue = gMetaIndex.Item(key)", text)
+        # Scripting.Dictionary is Windows-only; the .bas is also imported on Mac.
+        self.assertNotIn("CreateObject(\"Scripting.Dictionary\")", text)
+        # Module-level state must be declared before the first procedure.
+        self.assertLess(text.index("Private gMetaIndex As Collection"), text.index("Public Sub ClearMLDatasetExcel_Run()"))
+
+    def test_generate_vba_module_restores_application_state(self) -> None:
+        text = generate_vba_module(meta_sheet_name="_meta")
+        start = text.index("Public Sub ClearMLDatasetExcel_Run()")
+        run = text[start : text.index("End Sub", start)]
+        self.assertIn("Application.Calculation = xlCalculationManual", run)
+        self.assertIn("Application.Calculation = prevCalculation", run)
+        self.assertIn("Application.ScreenUpdating = prevScreenUpdating", run)
+        self.assertIn("Application.EnableEvents = prevEnableEvents", run)
+        # Every early exit goes through the CleanUp epilog.
+        self.assertEqual(run.count("Exit Sub"), 1)
+        self.assertLess(run.index("CleanUp:"), run.index("Exit Sub"))
+
     def test_generate_vba_module_has_shell_quote(self) -> None:
         text = generate_vba_module(meta_sheet_name="_meta")
         self.assertIn("Private Function ShellQuote", text)
@@ -31,6 +55,17 @@ class TestVbaAddin(unittest.TestCase):
         self.assertIn("ShellQuote = Chr(39) & t & Chr(39)", text)
         self.assertIn('/bin/zsh -lc ', text)
 
+    def test_write_vba_module_skips_unchanged_file(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            out = write_vba_module(Path(td) / "addin.bas", meta_sheet_name="_meta")
+            os.utime(out, ns=(1_000_000_000, 1_000_000_000))
+            write_vba_module(out, meta_sheet_name="_meta")
+            self.assertEqual(out.stat().st_mtime_ns, 1_000_000_000)
+
+            write_vba_module(out, meta_sheet_name="_other")
+            self.assertNotEqual(out.stat().st_mtime_ns, 1_000_000_000)
+            self.assertIn('"_other"', out.read_text(encoding="utf-8"))
+
 
 if __name__ == "__main__":
     unittest.main()